@@ -0,0 +1,27 @@
+"""
+Shared pytest fixtures for the test suite.
+
+Running the tests through pytest keeps everything in a single interpreter,
+so numpy is imported (and any JIT warmup paid) once for the whole suite
+instead of once per script invocation.
+"""
+
+import pytest
+
+from wzlz_ai import GameConfig, SimulationEnvironment
+
+
+@pytest.fixture(scope="module")
+def make_env():
+    """
+    Factory fixture for creating simulation environments.
+
+    Returns a callable taking GameConfig keyword arguments (plus an optional
+    ``seed``) so each test can request the exact configuration it needs
+    without repeating the construction boilerplate.
+    """
+    def _make(seed=42, **config_kwargs):
+        config = GameConfig(**config_kwargs)
+        return SimulationEnvironment(config, seed=seed)
+
+    return _make
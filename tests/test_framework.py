@@ -2,13 +2,15 @@
 Simple test to verify the framework works without external dependencies.
 """
 
-from wzlz_ai import GameState, GameConfig, Position, Move, BallColor
-from wzlz_ai import SimulationEnvironment
+from wzlz_ai import GameState, Position, BallColor
+import logging
+
+log = logging.getLogger(__name__)
 
 
 def test_game_state():
     """Test GameState creation and manipulation."""
-    print("Testing GameState...")
+    log.debug("Testing GameState...")
     
     # Create empty state
     state = GameState.create_empty(9, 9)
@@ -31,16 +33,16 @@ def test_game_state():
     assert state.score == 0  # Original unchanged
     assert cloned.score == 100
     
-    print("✓ GameState tests passed")
+    log.debug("✓ GameState tests passed")
 
 
-def test_simulation_environment():
+def test_simulation_environment(make_env):
     """Test SimulationEnvironment."""
-    print("\nTesting SimulationEnvironment...")
-    
-    config = GameConfig(rows=9, cols=9, colors_count=7)
-    env = SimulationEnvironment(config, seed=42)
-    
+    log.debug("\nTesting SimulationEnvironment...")
+
+    env = make_env(rows=9, cols=9, colors_count=7)
+    config = env.config
+
     # Test reset
     state = env.reset()
     assert state.rows == 9
@@ -53,12 +55,12 @@ def test_simulation_environment():
     # Should have next balls preview
     assert len(state.next_balls) == config.balls_per_turn
     
-    print(f"✓ Initial state has {len(occupied)} balls")
-    print(f"✓ Next balls: {[b.name for b in state.next_balls]}")
+    log.debug("✓ Initial state has %d balls", len(occupied))
+    log.debug("✓ Next balls: %s", [b.name for b in state.next_balls])
     
     # Test valid moves
     moves = env.get_valid_moves()
-    print(f"✓ Found {len(moves)} valid moves")
+    log.debug("✓ Found %d valid moves", len(moves))
     
     # Test pathfinding
     if len(occupied) > 0 and len(state.get_empty_positions()) > 0:
@@ -66,18 +68,17 @@ def test_simulation_environment():
         to_pos = state.get_empty_positions()[0]
         
         path_exists, path = env.is_path_clear(from_pos, to_pos)
-        print(f"✓ Path from {from_pos} to {to_pos}: {path_exists}")
+        log.debug("✓ Path from %s to %s: %s", from_pos, to_pos, path_exists)
     
-    print("✓ SimulationEnvironment tests passed")
+    log.debug("✓ SimulationEnvironment tests passed")
 
 
-def test_move_execution():
+def test_move_execution(make_env):
     """Test executing moves."""
-    print("\nTesting move execution...")
-    
-    config = GameConfig(rows=9, cols=9, colors_count=7)
-    env = SimulationEnvironment(config, seed=42)
-    
+    log.debug("\nTesting move execution...")
+
+    env = make_env(rows=9, cols=9, colors_count=7)
+
     state = env.reset()
     initial_score = state.score
     
@@ -86,30 +87,29 @@ def test_move_execution():
     
     if moves:
         move = moves[0]
-        print(f"Executing move: {move}")
+        log.debug("Executing move: %s", move)
         
         result = env.execute_move(move)
         
         assert result.success
         assert result.new_state is not None
-        print(f"✓ Move executed successfully")
-        print(f"  Points earned: {result.points_earned}")
-        print(f"  Balls removed: {len(result.balls_removed)}")
-        print(f"  New balls added: {len(result.new_balls_added)}")
-        print(f"  Path length: {len(result.path)}")
+        log.debug("✓ Move executed successfully")
+        log.debug("  Points earned: %d", result.points_earned)
+        log.debug("  Balls removed: %d", len(result.balls_removed))
+        log.debug("  New balls added: %d", len(result.new_balls_added))
+        log.debug("  Path length: %d", len(result.path))
     else:
-        print("⚠ No valid moves available")
+        log.debug("⚠ No valid moves available")
     
-    print("✓ Move execution tests passed")
+    log.debug("✓ Move execution tests passed")
 
 
-def test_game_loop():
+def test_game_loop(make_env):
     """Test a simple game loop."""
-    print("\nTesting game loop...")
-    
-    config = GameConfig(rows=9, cols=9, colors_count=7)
-    env = SimulationEnvironment(config, seed=42)
-    
+    log.debug("\nTesting game loop...")
+
+    env = make_env(rows=9, cols=9, colors_count=7)
+
     state = env.reset()
     
     max_moves = 5
@@ -117,22 +117,22 @@ def test_game_loop():
         moves = env.get_valid_moves()
         
         if not moves:
-            print(f"Game over after {i} moves")
+            log.debug("Game over after %d moves", i)
             break
         
         # Execute first valid move
         result = env.execute_move(moves[0])
         
         if result.success:
-            print(f"Move {i+1}: Score = {result.new_state.score}, "
-                  f"Valid moves = {len(env.get_valid_moves())}")
+            log.debug("Move %d: Score = %d, Valid moves = %d", i + 1,
+                      result.new_state.score, len(env.get_valid_moves()))
     
-    print("✓ Game loop tests passed")
+    log.debug("✓ Game loop tests passed")
 
 
 def test_state_representation():
     """Test state representation and features."""
-    print("\nTesting state representation...")
+    log.debug("\nTesting state representation...")
     
     state = GameState.create_empty(9, 9)
     
@@ -142,33 +142,31 @@ def test_state_representation():
     state.set_cell(Position(2, 2), BallColor.GREEN)
     
     # Test string representation
-    print("\nBoard visualization:")
-    print(state)
+    log.debug("\nBoard visualization:")
+    log.debug("%s", state)
     
     # Test feature vector
     features = state.to_feature_vector()
-    print(f"\n✓ Feature vector shape: {features.shape}")
+    log.debug("\n✓ Feature vector shape: %s", features.shape)
     assert features.shape == (9, 9, len(BallColor))
     
     # Test position queries
     empty = state.get_empty_positions()
     occupied = state.get_occupied_positions()
-    print(f"✓ Empty positions: {len(empty)}")
-    print(f"✓ Occupied positions: {len(occupied)}")
+    log.debug("✓ Empty positions: %d", len(empty))
+    log.debug("✓ Occupied positions: %d", len(occupied))
     assert len(empty) + len(occupied) == 81
     
-    print("✓ State representation tests passed")
+    log.debug("✓ State representation tests passed")
 
 
-def test_reproducibility():
+def test_reproducibility(make_env):
     """Test that same seed produces same results."""
-    print("\nTesting reproducibility...")
-    
-    config = GameConfig(rows=9, cols=9, colors_count=7)
-    
+    log.debug("\nTesting reproducibility...")
+
     # Create two environments with same seed
-    env1 = SimulationEnvironment(config, seed=42)
-    env2 = SimulationEnvironment(config, seed=42)
+    env1 = make_env(rows=9, cols=9, colors_count=7)
+    env2 = make_env(rows=9, cols=9, colors_count=7)
     
     state1 = env1.reset()
     state2 = env2.reset()
@@ -178,7 +176,7 @@ def test_reproducibility():
     assert np.array_equal(state1.board, state2.board)
     assert state1.next_balls == state2.next_balls
     
-    print("✓ Same seed produces identical states")
+    log.debug("✓ Same seed produces identical states")
     
     # Execute same moves
     moves1 = env1.get_valid_moves()
@@ -189,36 +187,12 @@ def test_reproducibility():
         result2 = env2.execute_move(moves2[0])
         
         assert np.array_equal(result1.new_state.board, result2.new_state.board)
-        print("✓ Same moves produce identical results")
+        log.debug("✓ Same moves produce identical results")
     
-    print("✓ Reproducibility tests passed")
+    log.debug("✓ Reproducibility tests passed")
 
 
 if __name__ == "__main__":
-    print("=" * 60)
-    print("FRAMEWORK TESTS")
-    print("=" * 60)
-    
-    try:
-        test_game_state()
-        test_simulation_environment()
-        test_move_execution()
-        test_state_representation()
-        test_reproducibility()
-        test_game_loop()
-        
-        print("\n" + "=" * 60)
-        print("ALL TESTS PASSED ✓")
-        print("=" * 60)
-        print("\nFramework is working correctly!")
-        print("\nNext steps:")
-        print("1. Implement game matching logic in game_environment.py")
-        print("2. Install dependencies: pip install -r requirements.txt")
-        print("3. Implement image recognition in game_client.py")
-        print("4. Build your ML model")
-        
-    except Exception as e:
-        print(f"\n❌ TEST FAILED: {e}")
-        import traceback
-        traceback.print_exc()
+    import pytest
+    pytest.main([__file__, "-v"])
 
@@ -4,21 +4,22 @@ Test game rules implementation.
 This module tests the matching logic, scoring, and game rules.
 """
 
-from wzlz_ai import SimulationEnvironment, GameConfig, GameState, Position, Move, BallColor
+from wzlz_ai import GameState, Position, Move, BallColor
 import numpy as np
+import logging
+import pytest
 
+log = logging.getLogger(__name__)
 
-def test_path_only_horizontal_vertical():
+
+def test_path_only_horizontal_vertical(make_env):
     """Test that paths can only be horizontal/vertical, not diagonal."""
-    config = GameConfig()
-    env = SimulationEnvironment(config, seed=42)
+    env = make_env()
     state = env.reset()
 
     # Create a scenario where diagonal would be shorter but is blocked
     # Clear the board first
-    for row in range(9):
-        for col in range(9):
-            state.set_cell(Position(row, col), BallColor.EMPTY)
+    state.clear()
 
     state.set_cell(Position(0, 0), BallColor.RED)
 
@@ -30,9 +31,9 @@ def test_path_only_horizontal_vertical():
     # Try to move to (2, 2) - should go around the obstacle
     path_exists, path = env.is_path_clear(Position(0, 0), Position(2, 2), state)
 
-    print(f"Path exists: {path_exists}")
-    print(f"Path length: {len(path) if path_exists else 0}")
-    print(f"Path: {path if path_exists else 'None'}")
+    log.debug("Path exists: %s", path_exists)
+    log.debug("Path length: %d", len(path) if path_exists else 0)
+    log.debug("Path: %s", path if path_exists else 'None')
 
     # Path should exist but be longer than diagonal (which would be 3 steps)
     assert path_exists, "Path should exist going around obstacle"
@@ -50,140 +51,82 @@ def test_path_only_horizontal_vertical():
         assert (row_diff == 1 and col_diff == 0) or (row_diff == 0 and col_diff == 1), \
             f"Path contains diagonal move from {curr} to {next_pos}"
 
-    print("✓ Path only uses horizontal/vertical moves")
+    log.debug("✓ Path only uses horizontal/vertical moves")
 
 
-def test_game_mode_with_preview():
+def test_game_mode_with_preview(make_env):
     """Test game mode with next ball preview."""
-    config = GameConfig(show_next_balls=True)
-    env = SimulationEnvironment(config, seed=42)
+    env = make_env(show_next_balls=True)
 
     state = env.reset()
 
     # Should have next balls preview
     assert len(state.next_balls) == 3, f"Should have 3 next balls, got {len(state.next_balls)}"
-    print(f"✓ Mode with preview: next_balls = {[b.name for b in state.next_balls]}")
+    log.debug("✓ Mode with preview: next_balls = %s", [b.name for b in state.next_balls])
 
 
-def test_game_mode_without_preview():
+def test_game_mode_without_preview(make_env):
     """Test game mode without next ball preview."""
-    config = GameConfig(show_next_balls=False)
-    env = SimulationEnvironment(config, seed=42)
+    env = make_env(show_next_balls=False)
 
     state = env.reset()
 
     # Should NOT have next balls preview
     assert len(state.next_balls) == 0, f"Should have 0 next balls, got {len(state.next_balls)}"
-    print("✓ Mode without preview: next_balls = []")
+    log.debug("✓ Mode without preview: next_balls = []")
 
 
-def test_horizontal_match():
-    """Test horizontal line matching."""
-    print("\n" + "="*60)
-    print("Testing Horizontal Match (5 balls in a row)")
-    print("="*60)
-    
-    config = GameConfig(rows=9, cols=9, match_length=5)
-    env = SimulationEnvironment(config, seed=42)
-    
-    # Create a custom state with 5 red balls in a row
-    state = GameState.create_empty(9, 9)
-    for col in range(5):
-        state.set_cell(Position(0, col), BallColor.RED)
-    
-    print("\nBefore matching:")
-    print(state)
-
-    # Check for matches
-    removed, count = env._check_and_remove_matches(state, Position(0, 2))
+LINE_MATCH_CASES = [
+    # (fill, color, anchor, line cells)
+    ("horizontal", BallColor.RED, Position(0, 2), [Position(0, col) for col in range(5)]),
+    ("vertical", BallColor.BLUE, Position(2, 0), [Position(row, 0) for row in range(5)]),
+    ("diagonal", BallColor.GREEN, Position(2, 2), [Position(i, i) for i in range(5)]),
+]
 
-    print(f"\n✓ Removed {count} balls")
-    print(f"✓ Positions: {removed}")
-
-    print("\nAfter matching:")
-    print(state)
-    
-    assert count == 5, f"Expected 5 balls removed, got {count}"
-    assert all(state.is_empty(Position(0, col)) for col in range(5)), "Balls not removed"
-    print("✓ Horizontal match test passed!")
 
+@pytest.mark.parametrize("direction,color,anchor,cells", LINE_MATCH_CASES,
+                         ids=[case[0] for case in LINE_MATCH_CASES])
+def test_line_match(make_env, direction, color, anchor, cells):
+    """Test matching 5 balls in a line (horizontal, vertical, diagonal)."""
+    env = make_env(rows=9, cols=9, match_length=5)
 
-def test_vertical_match():
-    """Test vertical line matching."""
-    print("\n" + "="*60)
-    print("Testing Vertical Match (5 balls in a column)")
-    print("="*60)
-    
-    config = GameConfig(rows=9, cols=9, match_length=5)
-    env = SimulationEnvironment(config, seed=42)
-    
-    # Create a custom state with 5 blue balls in a column
+    # Create a custom state with 5 balls in a line
     state = GameState.create_empty(9, 9)
-    for row in range(5):
-        state.set_cell(Position(row, 0), BallColor.BLUE)
-    
-    print("\nBefore matching:")
-    print(state)
-
-    # Check for matches
-    removed, count = env._check_and_remove_matches(state, Position(2, 0))
-
-    print(f"\n✓ Removed {count} balls")
-    print(f"✓ Positions: {removed}")
-
-    print("\nAfter matching:")
-    print(state)
-    
-    assert count == 5, f"Expected 5 balls removed, got {count}"
-    assert all(state.is_empty(Position(row, 0)) for row in range(5)), "Balls not removed"
-    print("✓ Vertical match test passed!")
-
+    if direction == "horizontal":
+        state.set_row(0, 0, 5, color)
+    elif direction == "vertical":
+        state.set_col(0, 0, 5, color)
+    else:
+        state.set_diag(0, 0, 5, color)
 
-def test_diagonal_match():
-    """Test diagonal line matching."""
-    print("\n" + "="*60)
-    print("Testing Diagonal Match (5 balls diagonally)")
-    print("="*60)
-    
-    config = GameConfig(rows=9, cols=9, match_length=5)
-    env = SimulationEnvironment(config, seed=42)
-    
-    # Create a custom state with 5 green balls diagonally
-    state = GameState.create_empty(9, 9)
-    for i in range(5):
-        state.set_cell(Position(i, i), BallColor.GREEN)
-    
-    print("\nBefore matching:")
-    print(state)
+    log.debug("\nBefore matching:")
+    log.debug("%s", state)
 
     # Check for matches
-    removed, count = env._check_and_remove_matches(state, Position(2, 2))
+    removed, count = env._check_and_remove_matches(state, anchor)
 
-    print(f"\n✓ Removed {count} balls")
-    print(f"✓ Positions: {removed}")
+    log.debug("\n✓ Removed %d balls", count)
+    log.debug("✓ Positions: %s", removed)
+
+    log.debug("\nAfter matching:")
+    log.debug("%s", state)
 
-    print("\nAfter matching:")
-    print(state)
-    
     assert count == 5, f"Expected 5 balls removed, got {count}"
-    assert all(state.is_empty(Position(i, i)) for i in range(5)), "Balls not removed"
-    print("✓ Diagonal match test passed!")
+    assert all(state.is_empty(cell) for cell in cells), "Balls not removed"
 
 
-def test_scoring():
+def test_scoring(make_env):
     """Test scoring system (2 points per ball)."""
-    print("\n" + "="*60)
-    print("Testing Scoring System")
-    print("="*60)
+    log.debug("\n" + "="*60)
+    log.debug("Testing Scoring System")
+    log.debug("="*60)
     
-    config = GameConfig(rows=9, cols=9, match_length=5, initial_balls=0)
-    env = SimulationEnvironment(config, seed=42)
+    env = make_env(rows=9, cols=9, match_length=5, initial_balls=0)
     state = env.reset()
     
     # Manually create a setup where we can make a match
     # Place 4 red balls in a row
-    for col in range(4):
-        state.set_cell(Position(4, col), BallColor.RED)
+    state.set_row(4, 0, 4, BallColor.RED)
     
     # Place a red ball that we'll move to complete the line
     state.set_cell(Position(3, 4), BallColor.RED)
@@ -193,43 +136,39 @@ def test_scoring():
     
     env._current_state = state
     
-    print("\nBefore move:")
-    print(state)
-    print(f"Score: {state.score}")
+    log.debug("\nBefore move:")
+    log.debug("%s", state)
+    log.debug("Score: %d", state.score)
 
     # Move the ball to complete the line
     move = Move(Position(3, 4), Position(4, 4))
     result = env.execute_move(move)
 
-    print("\nAfter move:")
-    print(result.new_state)
-    print(f"Score: {result.new_state.score}")
-    print(f"Points earned: {result.points_earned}")
-    print(f"Balls removed: {len(result.balls_removed)}")
+    log.debug("\nAfter move:")
+    log.debug("%s", result.new_state)
+    log.debug("Score: %d", result.new_state.score)
+    log.debug("Points earned: %d", result.points_earned)
+    log.debug("Balls removed: %d", len(result.balls_removed))
     
     assert result.success, "Move should succeed"
     assert len(result.balls_removed) == 5, f"Expected 5 balls removed, got {len(result.balls_removed)}"
     assert result.points_earned == 10, f"Expected 10 points (5 balls × 2), got {result.points_earned}"
     assert result.new_state.score == 10, f"Expected score 10, got {result.new_state.score}"
-    print("✓ Scoring test passed!")
+    log.debug("✓ Scoring test passed!")
 
 
-def test_no_points_for_auto_match():
+def test_no_points_for_auto_match(make_env):
     """Test that auto-matches after random generation give no points."""
-    print("\n" + "="*60)
-    print("Testing Auto-Match (No Points)")
-    print("="*60)
+    log.debug("\n" + "="*60)
+    log.debug("Testing Auto-Match (No Points)")
+    log.debug("="*60)
     
-    config = GameConfig(rows=9, cols=9, match_length=5, initial_balls=0)
-    env = SimulationEnvironment(config, seed=123)
+    env = make_env(seed=123, rows=9, cols=9, match_length=5, initial_balls=0)
     state = env.reset()
     
     # Create a setup where random balls will complete a line
     # Place 4 red balls in a row, leaving one gap
-    state.set_cell(Position(4, 0), BallColor.RED)
-    state.set_cell(Position(4, 1), BallColor.RED)
-    state.set_cell(Position(4, 2), BallColor.RED)
-    state.set_cell(Position(4, 3), BallColor.RED)
+    state.set_row(4, 0, 4, BallColor.RED)
     # Gap at Position(4, 4)
     
     # Place a ball to move (not creating a match)
@@ -240,117 +179,154 @@ def test_no_points_for_auto_match():
     
     env._current_state = state
     
-    print("\nBefore move:")
-    print(state)
-    print(f"Score: {state.score}")
+    log.debug("\nBefore move:")
+    log.debug("%s", state)
+    log.debug("Score: %d", state.score)
 
     # Make a move that doesn't create a match
     move = Move(Position(0, 0), Position(0, 1))
     result = env.execute_move(move)
 
-    print("\nAfter move:")
-    print(result.new_state)
-    print(f"Score: {result.new_state.score}")
-    print(f"Points earned from move: {result.points_earned}")
-    print(f"New balls added: {len(result.new_balls_added)}")
-    print(f"Total balls removed: {len(result.balls_removed)}")
+    log.debug("\nAfter move:")
+    log.debug("%s", result.new_state)
+    log.debug("Score: %d", result.new_state.score)
+    log.debug("Points earned from move: %d", result.points_earned)
+    log.debug("New balls added: %d", len(result.new_balls_added))
+    log.debug("Total balls removed: %d", len(result.balls_removed))
     
     # The move itself shouldn't earn points
     # If random balls create a match, still no points
     assert result.points_earned == 0, f"Expected 0 points from move, got {result.points_earned}"
-    print("✓ Auto-match test passed!")
+    log.debug("✓ Auto-match test passed!")
 
 
-def test_longer_match():
+def test_longer_match(make_env):
     """Test matching more than 5 balls."""
-    print("\n" + "="*60)
-    print("Testing Longer Match (7 balls)")
-    print("="*60)
+    log.debug("\n" + "="*60)
+    log.debug("Testing Longer Match (7 balls)")
+    log.debug("="*60)
     
-    config = GameConfig(rows=9, cols=9, match_length=5)
-    env = SimulationEnvironment(config, seed=42)
+    env = make_env(rows=9, cols=9, match_length=5)
     
     # Create a custom state with 7 yellow balls in a row
     state = GameState.create_empty(9, 9)
-    for col in range(7):
-        state.set_cell(Position(4, col), BallColor.YELLOW)
+    state.set_row(4, 0, 7, BallColor.YELLOW)
     
-    print("\nBefore matching:")
-    print(state)
+    log.debug("\nBefore matching:")
+    log.debug("%s", state)
 
     # Check for matches
     removed, count = env._check_and_remove_matches(state, Position(4, 3))
 
-    print(f"\n✓ Removed {count} balls")
-    print(f"✓ Positions: {removed}")
+    log.debug("\n✓ Removed %d balls", count)
+    log.debug("✓ Positions: %s", removed)
 
-    print("\nAfter matching:")
-    print(state)
+    log.debug("\nAfter matching:")
+    log.debug("%s", state)
     
     assert count == 7, f"Expected 7 balls removed, got {count}"
-    print("✓ Longer match test passed!")
+    log.debug("✓ Longer match test passed!")
 
 
-def test_multiple_matches():
+def test_multiple_matches(make_env):
     """Test multiple matches at once (cross pattern)."""
-    print("\n" + "="*60)
-    print("Testing Multiple Matches (Cross Pattern)")
-    print("="*60)
+    log.debug("\n" + "="*60)
+    log.debug("Testing Multiple Matches (Cross Pattern)")
+    log.debug("="*60)
     
-    config = GameConfig(rows=9, cols=9, match_length=5)
-    env = SimulationEnvironment(config, seed=42)
+    env = make_env(rows=9, cols=9, match_length=5)
     
     # Create a cross pattern with cyan balls
     state = GameState.create_empty(9, 9)
     
     # Horizontal line
-    for col in range(5):
-        state.set_cell(Position(4, col), BallColor.CYAN)
-    
+    state.set_row(4, 0, 5, BallColor.CYAN)
+
     # Vertical line (overlapping at center)
-    for row in range(5):
-        state.set_cell(Position(row, 2), BallColor.CYAN)
+    state.set_col(2, 0, 5, BallColor.CYAN)
     
-    print("\nBefore matching:")
-    print(state)
+    log.debug("\nBefore matching:")
+    log.debug("%s", state)
 
     # Check for matches at the center
     removed, count = env._check_and_remove_matches(state, Position(4, 2))
 
-    print(f"\n✓ Removed {count} balls")
-    print(f"✓ Positions: {removed}")
+    log.debug("\n✓ Removed %d balls", count)
+    log.debug("✓ Positions: %s", removed)
 
-    print("\nAfter matching:")
-    print(state)
+    log.debug("\nAfter matching:")
+    log.debug("%s", state)
     
     # Should remove 9 unique balls (5 horizontal + 5 vertical - 1 overlap)
     assert count == 9, f"Expected 9 balls removed, got {count}"
-    print("✓ Multiple matches test passed!")
+    log.debug("✓ Multiple matches test passed!")
+
+
+def test_undo_spawn_triggered_auto_match(make_env):
+    """Test that undo exactly reverses a move whose spawn auto-matched."""
+    env = make_env(rows=9, cols=9, match_length=5, balls_per_turn=2,
+                   initial_balls=0)
+    state = env.reset()
+    state.clear()
 
+    # Checkerboard fill: no two like colors ever line up
+    for row in range(9):
+        for col in range(9):
+            color = BallColor.BLUE if (row + col) % 2 == 0 else BallColor.GREEN
+            state.set_cell(Position(row, col), color)
+
+    # Four reds waiting on (8, 4); leave exactly (0, 1) and (8, 4)
+    # empty so both previewed reds land deterministically after the move
+    state.set_row(8, 0, 4, BallColor.RED)
+    state.set_cell(Position(0, 1), BallColor.EMPTY)
+    state.set_cell(Position(8, 4), BallColor.EMPTY)
+    state.next_balls = [BallColor.RED, BallColor.RED]
+    env._current_state = state
+
+    board_before = state.board.copy()
+    score_before = state.score
+    next_before = list(state.next_balls)
+    count_before = state.move_count
+
+    result = env.execute_move(Move(Position(0, 0), Position(0, 1)))
+    assert result.success
+
+    # The spawn at (8, 4) completed the red line and was auto-removed
+    assert Position(8, 4) in result.balls_removed
 
-def test_game_over():
+    # Undo must restore the exact pre-move board: the auto-removed
+    # spawn at (8, 4) appears in both removed and added, and must end
+    # EMPTY, not resurrect as a phantom red
+    assert env.undo_last_move()
+    after = env.get_state()
+    assert np.array_equal(after.board, board_before), "Undo corrupted the board"
+    assert after.score == score_before
+    assert after.next_balls == next_before
+    assert after.move_count == count_before
+    log.debug("✓ Spawn-triggered auto-match undo round-trips exactly")
+
+
+def test_game_over(make_env):
     """Test game over condition."""
-    print("\n" + "="*60)
-    print("Testing Game Over Condition")
-    print("="*60)
+    log.debug("\n" + "="*60)
+    log.debug("Testing Game Over Condition")
+    log.debug("="*60)
     
-    config = GameConfig(rows=3, cols=3, match_length=5, initial_balls=0)
-    env = SimulationEnvironment(config, seed=42)
+    env = make_env(rows=3, cols=3, match_length=5, initial_balls=0)
     state = env.reset()
     
     # Fill the board except one cell
     for row in range(3):
-        for col in range(3):
-            if row != 2 or col != 2:
-                state.set_cell(Position(row, col), BallColor.RED)
+        state.set_row(row, 0, 3, BallColor.RED)
+    state.set_cell(Position(2, 2), BallColor.EMPTY)
     
     env._current_state = state
     
-    print("\nBoard (almost full):")
-    print(state)
+    log.debug("\nBoard (almost full):")
+    log.debug("%s", state)
 
     is_over = env.is_game_over(state)
-    print(f"Game over: {is_over}")
+    log.debug("Game over: %s", is_over)
 
     # Should not be game over yet (one valid move exists)
     assert not is_over, "Game should not be over with valid moves"
@@ -359,33 +335,17 @@ def test_game_over():
     state.set_cell(Position(2, 2), BallColor.BLUE)
     env._current_state = state
 
-    print("\nBoard (completely full):")
-    print(state)
+    log.debug("\nBoard (completely full):")
+    log.debug("%s", state)
 
     is_over = env.is_game_over(state)
-    print(f"Game over: {is_over}")
+    log.debug("Game over: %s", is_over)
     
     # Should be game over now
     assert is_over, "Game should be over when board is full"
-    print("✓ Game over test passed!")
+    log.debug("✓ Game over test passed!")
 
 
 if __name__ == "__main__":
-    print("\n" + "="*60)
-    print("GAME RULES TESTS")
-    print("="*60)
-    
-    test_horizontal_match()
-    test_vertical_match()
-    test_diagonal_match()
-    test_scoring()
-    test_no_points_for_auto_match()
-    test_longer_match()
-    test_multiple_matches()
-    test_game_over()
-    
-    print("\n" + "="*60)
-    print("ALL GAME RULES TESTS PASSED ✓")
-    print("="*60)
-    print("\nGame rules implementation is complete and working correctly!")
-
+    import pytest
+    pytest.main([__file__, "-v"])
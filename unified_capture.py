@@ -4,94 +4,528 @@ Unified window capture module for capturing game windows using Win32 API.
 This module provides consistent window capture functionality across all scripts.
 """
 
+import ctypes
+import threading
+from ctypes import windll, wintypes
+
 import win32gui
 import win32ui
 import win32con
-from ctypes import windll
+import cv2
 from PIL import Image
 import numpy as np
 
 
+class _BITMAPINFOHEADER(ctypes.Structure):
+    _fields_ = [
+        ('biSize', wintypes.DWORD),
+        ('biWidth', ctypes.c_long),
+        ('biHeight', ctypes.c_long),
+        ('biPlanes', wintypes.WORD),
+        ('biBitCount', wintypes.WORD),
+        ('biCompression', wintypes.DWORD),
+        ('biSizeImage', wintypes.DWORD),
+        ('biXPelsPerMeter', ctypes.c_long),
+        ('biYPelsPerMeter', ctypes.c_long),
+        ('biClrUsed', wintypes.DWORD),
+        ('biClrImportant', wintypes.DWORD),
+    ]
+
+
+class _BITMAPINFO(ctypes.Structure):
+    _fields_ = [
+        ('bmiHeader', _BITMAPINFOHEADER),
+        ('bmiColors', wintypes.DWORD * 3),
+    ]
+
+
+_DIB_RGB_COLORS = 0
+_SRCCOPY = 0x00CC0020
+
+# Prototyped ctypes bindings for the per-frame GDI calls. Declaring
+# argtypes/restype once at import time lets ctypes skip its per-call
+# marshalling guesswork, and calling these directly avoids the pywin32
+# wrappers' dict lookups and error translation in the hot path.
+_user32 = windll.user32
+_gdi32 = windll.gdi32
+
+_PrintWindow = _user32.PrintWindow
+_PrintWindow.argtypes = [wintypes.HWND, wintypes.HDC, wintypes.UINT]
+_PrintWindow.restype = wintypes.BOOL
+
+_GetWindowRect = _user32.GetWindowRect
+_GetWindowRect.argtypes = [wintypes.HWND, ctypes.POINTER(wintypes.RECT)]
+_GetWindowRect.restype = wintypes.BOOL
+
+_BitBlt = _gdi32.BitBlt
+_BitBlt.argtypes = [wintypes.HDC, ctypes.c_int, ctypes.c_int, ctypes.c_int,
+                    ctypes.c_int, wintypes.HDC, ctypes.c_int, ctypes.c_int,
+                    wintypes.DWORD]
+_BitBlt.restype = wintypes.BOOL
+
+_GetDIBits = _gdi32.GetDIBits
+_GetDIBits.argtypes = [wintypes.HDC, wintypes.HBITMAP, wintypes.UINT,
+                       wintypes.UINT, ctypes.c_void_p,
+                       ctypes.POINTER(_BITMAPINFO), wintypes.UINT]
+_GetDIBits.restype = ctypes.c_int
+
+try:
+    # Windows Graphics Capture backend (Windows 10 1903+). Composition stays
+    # on the GPU, so frames arrive without the per-call GPU->CPU readback
+    # that the PrintWindow/BitBlt path pays.
+    from windows_capture import WindowsCapture
+    WGC_AVAILABLE = True
+except ImportError:
+    WGC_AVAILABLE = False
+
+try:
+    # DXGI Desktop Duplication backend. Frames arrive pre-converted on
+    # the GPU with much lower CPU cost than GDI, but it duplicates the
+    # composited desktop, so the target window must be visible on screen.
+    import dxcam
+    DXCAM_AVAILABLE = True
+except ImportError:
+    DXCAM_AVAILABLE = False
+
+
+class _WGCSession:
+    """Persistent Windows Graphics Capture session for a single window."""
+
+    def __init__(self, window_title: str):
+        self.window_title = window_title
+        self._frame = None
+        self._lock = threading.Lock()
+        self._frame_ready = threading.Event()
+        self._closed = False
+
+        capture = WindowsCapture(
+            cursor_capture=False,
+            draw_border=False,
+            window_name=window_title,
+        )
+
+        @capture.event
+        def on_frame_arrived(frame, capture_control):
+            with self._lock:
+                self._frame = frame.frame_buffer.copy()
+            self._frame_ready.set()
+
+        @capture.event
+        def on_closed():
+            self._closed = True
+            self._frame_ready.set()
+
+        self._control = capture.start_free_threaded()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def get_frame(self, timeout: float = 1.0):
+        """Get the most recent frame as a contiguous BGRA numpy array."""
+        if not self._frame_ready.wait(timeout) or self._closed:
+            return None
+        with self._lock:
+            return self._frame
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            try:
+                self._control.stop()
+            except Exception:
+                pass
+
+
+# Active WGC sessions keyed by window title
+_wgc_sessions = {}
+
+# Lazily created desktop-duplication camera shared by all windows
+_dxcam_camera = None
+
+
+def _get_dxcam():
+    """Create the desktop-duplication camera on first use."""
+    global _dxcam_camera, DXCAM_AVAILABLE
+    if _dxcam_camera is None and DXCAM_AVAILABLE:
+        try:
+            _dxcam_camera = dxcam.create(output_color="BGR")
+        except Exception:
+            # No duplication available (e.g. RDP session); stick to GDI
+            DXCAM_AVAILABLE = False
+    return _dxcam_camera
+
+
+def _capture_via_dxgi(hwnd: int, region=None):
+    """
+    Grab a window (or window-relative region) via desktop duplication.
+
+    Returns None when duplication is unavailable or no fresh frame has
+    been composited since the last grab, in which case the caller falls
+    through to the GDI path.
+    """
+    camera = _get_dxcam()
+    if camera is None:
+        return None
+
+    rect = wintypes.RECT()
+    _GetWindowRect(hwnd, ctypes.byref(rect))
+    if region is not None:
+        x, y, w, h = region
+        grab_region = (rect.left + x, rect.top + y,
+                       rect.left + x + w, rect.top + y + h)
+    else:
+        grab_region = (rect.left, rect.top, rect.right, rect.bottom)
+
+    try:
+        return camera.grab(region=grab_region)
+    except Exception:
+        return None
+
+
+class _BufferPool:
+    """
+    Free list of reusable uint8 image buffers keyed by shape.
+
+    Capture paths allocate full-frame arrays at a steady rate; recycling
+    them through a small pool avoids the repeated malloc/free churn.
+    """
+
+    def __init__(self, max_per_key: int = 4):
+        self._free = {}
+        self._max_per_key = max_per_key
+
+    def acquire(self, height: int, width: int, channels: int = 3) -> np.ndarray:
+        key = (height, width, channels)
+        free = self._free.get(key)
+        if free:
+            return free.pop()
+        return np.empty(key, dtype=np.uint8)
+
+    def release(self, buf: np.ndarray):
+        free = self._free.setdefault(buf.shape, [])
+        if len(free) < self._max_per_key:
+            free.append(buf)
+
+
+_buffer_pool = _BufferPool()
+
+
+class _GDICapturer:
+    """
+    GDI capture resources persisted across frames for a single window.
+
+    Creating and tearing down the DCs and the compatible bitmap on every
+    capture is a significant fraction of frame time; this keeps them alive
+    and only recreates the bitmap when the window is resized.
+
+    When ``region`` is given, only that (x, y, width, height) sub-rect of
+    the window is blitted, so a board-sized read moves a fraction of the
+    bytes of a full-window capture.
+    """
+
+    def __init__(self, hwnd: int, region=None):
+        self.hwnd = hwnd
+        self.region = region
+        self._hwnd_dc = None
+        self._mfc_dc = None
+        self._save_dc = None
+        self._bitmap = None
+        self._last_size = None
+        self._bgra_buf = None
+        self._bgr_buf = None
+        self._bmi = None
+        # Raw handles cached so the per-frame calls stay pure ctypes
+        self._save_hdc = None
+        self._mfc_hdc = None
+        self._bitmap_handle = None
+
+    def _ensure_resources(self, width: int, height: int):
+        """(Re)create the DCs/bitmap if missing or the window was resized."""
+        if self._last_size == (width, height):
+            return
+
+        if self._mfc_dc is None:
+            self._hwnd_dc = win32gui.GetWindowDC(self.hwnd)
+            self._mfc_dc = win32ui.CreateDCFromHandle(self._hwnd_dc)
+            self._save_dc = self._mfc_dc.CreateCompatibleDC()
+
+        if self._bitmap is not None:
+            win32gui.DeleteObject(self._bitmap.GetHandle())
+
+        self._bitmap = win32ui.CreateBitmap()
+        self._bitmap.CreateCompatibleBitmap(self._mfc_dc, width, height)
+        self._save_dc.SelectObject(self._bitmap)
+
+        self._save_hdc = self._save_dc.GetSafeHdc()
+        self._mfc_hdc = self._mfc_dc.GetSafeHdc()
+        self._bitmap_handle = self._bitmap.GetHandle()
+
+        # Grab pixel buffers from the shared pool and build the DIB header
+        # used by GetDIBits
+        if self._bgra_buf is not None:
+            _buffer_pool.release(self._bgra_buf)
+            _buffer_pool.release(self._bgr_buf)
+        self._bgra_buf = _buffer_pool.acquire(height, width, 4)
+        self._bgr_buf = _buffer_pool.acquire(height, width, 3)
+        bmi = _BITMAPINFO()
+        bmi.bmiHeader.biSize = ctypes.sizeof(_BITMAPINFOHEADER)
+        bmi.bmiHeader.biWidth = width
+        bmi.bmiHeader.biHeight = -height  # top-down rows
+        bmi.bmiHeader.biPlanes = 1
+        bmi.bmiHeader.biBitCount = 32
+        bmi.bmiHeader.biCompression = 0  # BI_RGB
+        self._bmi = bmi
+
+        self._last_size = (width, height)
+
+    def capture(self, channels: int = 3):
+        """
+        Capture the window (or region) into the cached bitmap.
+
+        The returned array is the capturer's persistent buffer and is
+        overwritten by the next capture; callers that keep frames must
+        copy (the module-level wrappers do).
+
+        Args:
+            channels: 3 for converted BGR output, 4 for the raw BGRA buffer
+        """
+        if self.region is not None:
+            src_x, src_y, width, height = self.region
+            self._ensure_resources(width, height)
+            # Partial blit straight from the window DC — only the region's
+            # bytes are moved, so PrintWindow (whole window) is skipped
+            _BitBlt(self._save_hdc, 0, 0, width, height, self._mfc_hdc,
+                    src_x, src_y, _SRCCOPY)
+        else:
+            rect = wintypes.RECT()
+            _GetWindowRect(self.hwnd, ctypes.byref(rect))
+            width = rect.right - rect.left
+            height = rect.bottom - rect.top
+
+            self._ensure_resources(width, height)
+
+            result = _PrintWindow(self.hwnd, self._save_hdc, 3)
+            if result == 0:
+                # PrintWindow failed, try BitBlt
+                _BitBlt(self._save_hdc, 0, 0, width, height, self._mfc_hdc,
+                        0, 0, _SRCCOPY)
+
+        # Read the pixels straight into the persistent BGRA buffer —
+        # GetBitmapBits would allocate a fresh bytes object per frame
+        _GetDIBits(self._save_hdc, self._bitmap_handle,
+                   0, height, self._bgra_buf.ctypes.data,
+                   ctypes.byref(self._bmi), _DIB_RGB_COLORS)
+
+        if channels == 4:
+            return self._bgra_buf
+
+        # SIMD-accelerated BGRA->BGR into the persistent output buffer;
+        # the result is contiguous (a plain [:, :, :3] slice is not)
+        cv2.cvtColor(self._bgra_buf, cv2.COLOR_BGRA2BGR, dst=self._bgr_buf)
+        return self._bgr_buf
+
+    def close(self):
+        """Release all cached GDI objects."""
+        if self._bitmap is not None:
+            win32gui.DeleteObject(self._bitmap.GetHandle())
+            self._bitmap = None
+        if self._save_dc is not None:
+            self._save_dc.DeleteDC()
+            self._save_dc = None
+        if self._mfc_dc is not None:
+            self._mfc_dc.DeleteDC()
+            self._mfc_dc = None
+        if self._hwnd_dc is not None:
+            win32gui.ReleaseDC(self.hwnd, self._hwnd_dc)
+            self._hwnd_dc = None
+        if self._bgra_buf is not None:
+            _buffer_pool.release(self._bgra_buf)
+            _buffer_pool.release(self._bgr_buf)
+        self._bgra_buf = None
+        self._bgr_buf = None
+        self._bmi = None
+        self._save_hdc = None
+        self._mfc_hdc = None
+        self._bitmap_handle = None
+        self._last_size = None
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+# Persistent GDI capturers keyed by window handle
+_gdi_capturers = {}
+
+# Persistent region capturers keyed by (hwnd, region)
+_gdi_region_capturers = {}
+
+
+def _capture_via_gdi(hwnd: int, channels: int = 3):
+    """Capture a window through a cached GDI capturer."""
+    capturer = _gdi_capturers.get(hwnd)
+    if capturer is None:
+        capturer = _GDICapturer(hwnd)
+        _gdi_capturers[hwnd] = capturer
+    # Callers own their frame: hand out a copy of the capturer's
+    # persistent buffer so the next capture can't rewrite a frame a
+    # caller is still holding
+    return capturer.capture(channels).copy()
+
+
+def _capture_hwnd_region(hwnd: int, region: tuple):
+    """Capture only a sub-rect of a window through a cached region capturer."""
+    key = (hwnd, tuple(region))
+    capturer = _gdi_region_capturers.get(key)
+    if capturer is None:
+        capturer = _GDICapturer(hwnd, region=tuple(region))
+        _gdi_region_capturers[key] = capturer
+    # Copy out of the persistent buffer; see _capture_via_gdi
+    return capturer.capture().copy()
+
+
+def _capture_via_wgc(window_title: str):
+    """Capture a window through a cached WGC session, or None on failure."""
+    session = _wgc_sessions.get(window_title)
+    if session is not None and session.closed:
+        _wgc_sessions.pop(window_title, None)
+        session = None
+
+    if session is None:
+        try:
+            session = _WGCSession(window_title)
+        except Exception:
+            return None
+        _wgc_sessions[window_title] = session
+
+    return session.get_frame()
+
+
+# Resolved window handles keyed by title. FindWindow walks the top-level
+# window list on every call; in a capture loop that traversal dominates the
+# actual pixel copy, while the handle itself only changes when the window
+# is recreated.
+_hwnd_cache = {}
+
+
+def _resolve_hwnd(window_title: str) -> int:
+    """Find a window handle by title, using the cache when still valid."""
+    hwnd = _hwnd_cache.get(window_title)
+    if hwnd and win32gui.IsWindow(hwnd):
+        return hwnd
+
+    hwnd = win32gui.FindWindow(None, window_title)
+    if hwnd:
+        _hwnd_cache[window_title] = hwnd
+    else:
+        _hwnd_cache.pop(window_title, None)
+    return hwnd
+
+
+def invalidate_window_cache(window_title: str = None):
+    """Drop cached window handles (all of them if no title is given)."""
+    if window_title is None:
+        _hwnd_cache.clear()
+    else:
+        _hwnd_cache.pop(window_title, None)
+
+
 def get_window_rect(window_title: str):
     """
     Get the window rectangle (position and size).
-    
+
     Args:
         window_title: Title of the window to find
-        
+
     Returns:
         Tuple of (left, top, right, bottom) or None if window not found
     """
-    hwnd = win32gui.FindWindow(None, window_title)
+    hwnd = _resolve_hwnd(window_title)
     if not hwnd:
         return None
-    
+
     return win32gui.GetWindowRect(hwnd)
 
 
-def capture_game_window(window_title: str, bring_to_front: bool = False):
+def focus_window(window_title: str) -> bool:
+    """
+    Bring a window to the foreground, restoring it if minimized.
+
+    Call this once at startup (or after alt-tabbing away); the capture
+    functions themselves work on occluded windows, so foregrounding does
+    not belong in the per-frame path.
+
+    Args:
+        window_title: Title of the window to focus
+
+    Returns:
+        True if the window was found, False otherwise
+    """
+    hwnd = _resolve_hwnd(window_title)
+    if not hwnd:
+        return False
+    try:
+        if win32gui.IsIconic(hwnd):
+            win32gui.ShowWindow(hwnd, win32con.SW_RESTORE)
+        win32gui.SetForegroundWindow(hwnd)
+    except:
+        pass  # May fail due to foreground-lock restrictions; capture still works
+    return True
+
+
+def capture_game_window(window_title: str, bring_to_front: bool = False,
+                        channels: int = 3):
     """
     Capture a game window using Win32 API.
-    
+
     Args:
         window_title: Title of the window to capture
-        bring_to_front: Whether to bring window to front before capturing
-        
+        bring_to_front: Deprecated; call focus_window() once instead of
+            foregrounding (and forcing a DWM re-render) on every frame
+        channels: 3 for BGR output, 4 to skip the conversion and get BGRA
+
     Returns:
-        numpy array (BGR format) of the captured window, or None if failed
+        Contiguous numpy array of the captured window, or None if failed
     """
     # Find the window
-    hwnd = win32gui.FindWindow(None, window_title)
+    hwnd = _resolve_hwnd(window_title)
     if not hwnd:
         print(f"Window '{window_title}' not found")
         return None
-    
-    # Bring to front if requested
+
     if bring_to_front:
-        try:
-            win32gui.SetForegroundWindow(hwnd)
-        except:
-            pass  # May fail if window is minimized or permissions issue
-    
-    # Get window dimensions
-    left, top, right, bottom = win32gui.GetWindowRect(hwnd)
-    width = right - left
-    height = bottom - top
-    
-    # Get window device context
-    hwndDC = win32gui.GetWindowDC(hwnd)
-    mfcDC = win32ui.CreateDCFromHandle(hwndDC)
-    saveDC = mfcDC.CreateCompatibleDC()
-    
-    # Create bitmap
-    saveBitMap = win32ui.CreateBitmap()
-    saveBitMap.CreateCompatibleBitmap(mfcDC, width, height)
-    saveDC.SelectObject(saveBitMap)
-    
-    # Capture the window
-    result = windll.user32.PrintWindow(hwnd, saveDC.GetSafeHdc(), 3)
-    
-    if result == 0:
-        # PrintWindow failed, try BitBlt
-        saveDC.BitBlt((0, 0), (width, height), mfcDC, (0, 0), win32con.SRCCOPY)
-    
-    # Convert to numpy array
-    bmpinfo = saveBitMap.GetInfo()
-    bmpstr = saveBitMap.GetBitmapBits(True)
-    
-    img = np.frombuffer(bmpstr, dtype=np.uint8)
-    img.shape = (height, width, 4)
-    
-    # Convert BGRA to BGR
-    img = img[:, :, :3]
-    
-    # Clean up
-    win32gui.DeleteObject(saveBitMap.GetHandle())
-    saveDC.DeleteDC()
-    mfcDC.DeleteDC()
-    win32gui.ReleaseDC(hwnd, hwndDC)
-    
-    return img
+        focus_window(window_title)
+
+    # Prefer the GPU-side Windows Graphics Capture path when available;
+    # fall back to the legacy PrintWindow/BitBlt path below
+    if WGC_AVAILABLE:
+        img = _capture_via_wgc(window_title)
+        if img is not None:
+            if channels == 4:
+                return img
+            # Real conversion rather than a strided [:, :, :3] slice, so
+            # downstream OpenCV/PIL consumers get contiguous memory
+            return cv2.cvtColor(img, cv2.COLOR_BGRA2BGR)
+
+    # Next preference: desktop duplication (already BGR, GPU-converted)
+    if DXCAM_AVAILABLE and channels == 3:
+        img = _capture_via_dxgi(hwnd)
+        if img is not None:
+            return img
+
+    # Legacy GDI path with persistent DCs/bitmap
+    try:
+        return _capture_via_gdi(hwnd, channels)
+    except Exception:
+        # Window may have been destroyed/resized mid-capture; drop the
+        # cached resources and retry once from scratch
+        capturer = _gdi_capturers.pop(hwnd, None)
+        if capturer is not None:
+            capturer.close()
+        return _capture_via_gdi(hwnd, channels)
 
 
 def capture_window_region(window_title: str, region: tuple, bring_to_front: bool = False):
@@ -106,14 +540,34 @@ def capture_window_region(window_title: str, region: tuple, bring_to_front: bool
     Returns:
         numpy array (BGR format) of the captured region, or None if failed
     """
-    # Capture full window
-    img = capture_game_window(window_title, bring_to_front)
-    if img is None:
+    # With WGC the full frame is already on hand, so slicing it is cheap;
+    # on the GDI path blit only the requested sub-rect instead of paying
+    # for a full-window capture
+    if bring_to_front or (WGC_AVAILABLE and window_title in _wgc_sessions):
+        img = capture_game_window(window_title, bring_to_front)
+        if img is None:
+            return None
+        x, y, w, h = region
+        return img[y:y+h, x:x+w]
+
+    hwnd = _resolve_hwnd(window_title)
+    if not hwnd:
+        print(f"Window '{window_title}' not found")
         return None
-    
-    # Extract region
-    x, y, w, h = region
-    return img[y:y+h, x:x+w]
+
+    if DXCAM_AVAILABLE:
+        img = _capture_via_dxgi(hwnd, region)
+        if img is not None:
+            return img
+
+    try:
+        return _capture_hwnd_region(hwnd, region)
+    except Exception:
+        key = (hwnd, tuple(region))
+        capturer = _gdi_region_capturers.pop(key, None)
+        if capturer is not None:
+            capturer.close()
+        return _capture_hwnd_region(hwnd, region)
 
 
 def find_window(window_title: str):
@@ -126,26 +580,38 @@ def find_window(window_title: str):
     Returns:
         True if window exists, False otherwise
     """
-    hwnd = win32gui.FindWindow(None, window_title)
+    hwnd = _resolve_hwnd(window_title)
     return hwnd != 0
 
 
+_WNDENUMPROC = ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+
+
 def list_windows():
     """
     List all visible windows.
-    
+
     Returns:
         List of window titles
     """
     windows = []
-    
-    def callback(hwnd, extra):
-        if win32gui.IsWindowVisible(hwnd):
-            title = win32gui.GetWindowText(hwnd)
-            if title:
-                windows.append(title)
-    
-    win32gui.EnumWindows(callback, None)
+    user32 = windll.user32
+    # One reusable text buffer; titles are only copied out for windows that
+    # pass the visibility and non-empty-title checks
+    buf = ctypes.create_unicode_buffer(512)
+
+    @_WNDENUMPROC
+    def callback(hwnd, lparam):
+        if not user32.IsWindowVisible(hwnd):
+            return True
+        length = user32.GetWindowTextLengthW(hwnd)
+        if length == 0:
+            return True
+        user32.GetWindowTextW(hwnd, buf, min(length + 1, 512))
+        windows.append(buf.value)
+        return True
+
+    user32.EnumWindows(callback, 0)
     return windows
 
 
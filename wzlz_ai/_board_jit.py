@@ -0,0 +1,154 @@
+"""
+JIT-compiled board classification kernel.
+
+Compiles the cell-sampling + hue-lookup classification used by the game
+client into one tight loop, so a frame is classified without the
+intermediate resize/cvtColor allocations of the numpy path. Falls back
+to plain Python (and the caller's numpy path) when numba is missing.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _classify_board(img, hue_to_ball, s_min, v_min, rows, cols):
+    """
+    Classify a board image into an int8 (rows, cols) color grid.
+
+    Each cell is averaged over its center 50% (grid lines and ball edges
+    stay out of the mean), converted to OpenCV-convention HSV and looked
+    up in the hue table; desaturated or dark cells stay EMPTY. Channel 0
+    is treated as red, matching the COLOR_RGB2HSV classifier path.
+    """
+    out = np.zeros((rows, cols), dtype=np.int8)
+    img_h, img_w = img.shape[0], img.shape[1]
+
+    for row in range(rows):
+        y0 = img_h * (4 * row + 1) // (4 * rows)
+        y1 = img_h * (4 * row + 3) // (4 * rows)
+        for col in range(cols):
+            x0 = img_w * (4 * col + 1) // (4 * cols)
+            x1 = img_w * (4 * col + 3) // (4 * cols)
+
+            sum_r = 0
+            sum_g = 0
+            sum_b = 0
+            count = 0
+            for y in range(y0, y1):
+                for x in range(x0, x1):
+                    sum_r += img[y, x, 0]
+                    sum_g += img[y, x, 1]
+                    sum_b += img[y, x, 2]
+                    count += 1
+            if count == 0:
+                continue
+
+            red = sum_r / count
+            green = sum_g / count
+            blue = sum_b / count
+
+            # OpenCV uint8 HSV: V = max, S = 255*delta/max, H in 0..179
+            value = max(red, green, blue)
+            if value < v_min:
+                continue
+            delta = value - min(red, green, blue)
+            if value == 0 or 255.0 * delta / value < s_min:
+                continue
+
+            if delta == 0:
+                hue = 0.0
+            elif value == red:
+                hue = 30.0 * (green - blue) / delta
+            elif value == green:
+                hue = 60.0 + 30.0 * (blue - red) / delta
+            else:
+                hue = 120.0 + 30.0 * (red - green) / delta
+            if hue < 0.0:
+                hue += 180.0
+
+            hue_bin = int(hue)
+            if hue_bin > 179:
+                hue_bin = 179
+            out[row, col] = hue_to_ball[hue_bin]
+
+    return out
+
+
+def _classify_cells_nearest(cells, samples, labels, threshold_sq):
+    """
+    Nearest-sample classification of per-cell mean colors.
+
+    cells is a float32 (rows, cols, 3) array of RGB means, samples a
+    float32 (k, 3) palette with labels giving the int8 ball value per
+    sample. Cells farther than threshold_sq (squared distance) from
+    every sample classify as EMPTY. Matches the broadcast path in
+    GameStateReader._parse_board value for value.
+    """
+    rows, cols = cells.shape[0], cells.shape[1]
+    out = np.empty((rows, cols), dtype=np.int8)
+    for r in range(rows):
+        for c in range(cols):
+            best = np.int8(0)
+            # Large finite sentinel: fastmath may not honor inf compares
+            best_d = np.float32(1e30)
+            for k in range(samples.shape[0]):
+                d0 = cells[r, c, 0] - samples[k, 0]
+                d1 = cells[r, c, 1] - samples[k, 1]
+                d2 = cells[r, c, 2] - samples[k, 2]
+                d = d0 * d0 + d1 * d1 + d2 * d2
+                if d < best_d:
+                    best_d = d
+                    best = labels[k]
+            out[r, c] = best if best_d <= threshold_sq else np.int8(0)
+    return out
+
+
+def _max_pair_mean_diff(stack):
+    """
+    Max mean absolute difference over all frame pairs in a stack.
+
+    Takes an (n, h, w, c) uint8 stack of rapid captures of one cell and
+    returns the largest per-pair mean |a - b| as float; no temporaries
+    the size of a frame are allocated.
+    """
+    n = stack.shape[0]
+    pixels = stack.shape[1] * stack.shape[2] * stack.shape[3]
+    flat = stack.reshape(n, pixels)
+
+    max_diff = 0.0
+    for i in range(n):
+        for j in range(i + 1, n):
+            acc = 0
+            for k in range(pixels):
+                # Cast before subtracting: uint8 differences would wrap
+                d = np.int32(flat[i, k]) - np.int32(flat[j, k])
+                if d < 0:
+                    d = -d
+                acc += d
+            mean = acc / pixels
+            if mean > max_diff:
+                max_diff = mean
+    return max_diff
+
+
+if NUMBA_AVAILABLE:
+    classify_board = njit(cache=True, nogil=True)(_classify_board)
+    classify_cells_nearest = njit(cache=True, nogil=True, fastmath=True)(_classify_cells_nearest)
+    max_pair_mean_diff = njit(cache=True, nogil=True, fastmath=True)(_max_pair_mean_diff)
+    # Warm the compile (disk-cached afterwards) so the first real frame
+    # doesn't pay the JIT cost mid-game
+    classify_board(np.zeros((90, 90, 3), dtype=np.uint8),
+                   np.zeros(180, dtype=np.int8), 80, 80, 9, 9)
+    classify_cells_nearest(np.zeros((9, 9, 3), dtype=np.float32),
+                           np.zeros((1, 3), dtype=np.float32),
+                           np.zeros(1, dtype=np.int8), np.float32(1.0))
+    max_pair_mean_diff(np.zeros((2, 4, 4, 3), dtype=np.uint8))
+else:
+    classify_board = _classify_board
+    classify_cells_nearest = _classify_cells_nearest
+    max_pair_mean_diff = _max_pair_mean_diff
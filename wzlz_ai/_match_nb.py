@@ -0,0 +1,86 @@
+"""
+Compiled match detection around a single cell.
+
+After a move only lines through the destination can complete, so the
+kernel scans the four directions outward from one cell with plain
+integer steps over the int8 board — no strip gather, no temporaries —
+and returns the flat indices of every cell in a qualifying run.
+
+The kernel is built per configuration by make_match_kernel, which bakes
+the board shape and match length in as closure constants so numba can
+fold the bounds checks and unroll the run scans; each constant set gets
+its own disk-cache entry. Falls back to the same closure uncompiled
+when numba is missing.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def make_match_kernel(rows, cols, match_length):
+    """
+    Build a match detector specialized to one board geometry.
+
+    The returned kernel(board, row, col) finds all matched cells in
+    lines through (row, col): it returns the sorted flat indices
+    (row * cols + col) of every cell in a same-color run of at least
+    match_length passing through the given cell, empty when the cell is
+    empty or no direction qualifies. Detection only — the caller
+    removes.
+    """
+    n = rows * cols
+
+    def kernel(board, row, col):
+        color = board[row, col]
+        if color == 0:
+            return np.empty(0, dtype=np.int32)
+
+        matched = np.zeros(n, dtype=np.uint8)
+        for k in range(4):
+            if k == 0:
+                dr, dc = 0, 1
+            elif k == 1:
+                dr, dc = 1, 0
+            elif k == 2:
+                dr, dc = 1, 1
+            else:
+                dr, dc = 1, -1
+
+            forward = 0
+            r = row + dr
+            c = col + dc
+            while 0 <= r < rows and 0 <= c < cols and board[r, c] == color:
+                forward += 1
+                r += dr
+                c += dc
+
+            backward = 0
+            r = row - dr
+            c = col - dc
+            while 0 <= r < rows and 0 <= c < cols and board[r, c] == color:
+                backward += 1
+                r -= dr
+                c -= dc
+
+            if forward + backward + 1 >= match_length:
+                for step in range(-backward, forward + 1):
+                    matched[(row + step * dr) * cols + (col + step * dc)] = 1
+
+        out = np.empty(n, dtype=np.int32)
+        count = 0
+        for i in range(n):
+            if matched[i]:
+                out[count] = i
+                count += 1
+        return out[:count].copy()
+
+    if NUMBA_AVAILABLE:
+        kernel = njit(cache=True, nogil=True)(kernel)
+        # Warm the compile (disk-cached afterwards)
+        kernel(np.zeros((rows, cols), dtype=np.int8), 0, 0)
+    return kernel
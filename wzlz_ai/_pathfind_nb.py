@@ -0,0 +1,147 @@
+"""
+Compiled pathfinding kernels for the simulation environment.
+
+The BFS here works entirely in flat int32 cell indices (row * cols +
+col) with a parent-pointer array, so the hot loop allocates no Position
+objects and no per-node path copies; callers rebuild Position lists at
+the Python boundary. Falls back to the same code uncompiled when numba
+is missing.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def build_neighbor_table(rows, cols):
+    """
+    Per-cell flat indices of the 4 neighbors, -1 where off-board.
+
+    Columns are ordered right, down, left, up — the expansion order the
+    BFS has always used — so precomputing the table does not change
+    which of several equal-length paths is found.
+    """
+    table = np.full((rows * cols, 4), -1, dtype=np.int32)
+    for r in range(rows):
+        for c in range(cols):
+            i = r * cols + c
+            if c + 1 < cols:
+                table[i, 0] = i + 1
+            if r + 1 < rows:
+                table[i, 1] = i + cols
+            if c > 0:
+                table[i, 2] = i - 1
+            if r > 0:
+                table[i, 3] = i - cols
+    return table
+
+
+def _bfs_path(board, neighbors, start_row, start_col, target_row, target_col):
+    """
+    Shortest path over empty cells from start to target.
+
+    The target cell itself may be occupied (moving onto it is the point);
+    every intermediate step must be empty. neighbors is the table from
+    build_neighbor_table for this board size. Returns the flat indices
+    of the path including both endpoints, or an empty array when the
+    target is unreachable.
+    """
+    rows, cols = board.shape
+    n = rows * cols
+    flat_board = board.ravel()
+    start = start_row * cols + start_col
+    target = target_row * cols + target_col
+
+    # parent doubles as the visited marker (-1 = unseen)
+    parent = np.full(n, -1, dtype=np.int32)
+    queue = np.empty(n, dtype=np.int32)
+    parent[start] = start
+    queue[0] = start
+    head = 0
+    tail = 1
+    found = start == target
+
+    while head < tail and not found:
+        cur = queue[head]
+        head += 1
+        for k in range(4):
+            idx = neighbors[cur, k]
+            if idx < 0:
+                continue
+            if parent[idx] != -1:
+                continue
+            if flat_board[idx] == 0 or idx == target:
+                parent[idx] = cur
+                if idx == target:
+                    found = True
+                    break
+                queue[tail] = idx
+                tail += 1
+
+    if not found:
+        return np.empty(0, dtype=np.int32)
+
+    # Walk parents back from the target, then reverse
+    path = np.empty(n, dtype=np.int32)
+    count = 0
+    cur = target
+    while cur != start:
+        path[count] = cur
+        count += 1
+        cur = parent[cur]
+    path[count] = start
+    count += 1
+    return path[:count][::-1].copy()
+
+
+def _label_empty_components(board, neighbors):
+    """
+    Label the connected components of empty cells.
+
+    neighbors is the table from build_neighbor_table for this board
+    size. Returns (labels, component_count) where labels is an int32
+    board holding the component id per empty cell and -1 on occupied
+    cells.
+    """
+    rows, cols = board.shape
+    n = rows * cols
+    flat_board = board.ravel()
+    flat_labels = np.full(n, -1, dtype=np.int32)
+    queue = np.empty(n, dtype=np.int32)
+    next_label = 0
+
+    for seed in range(n):
+        if flat_board[seed] != 0 or flat_labels[seed] != -1:
+            continue
+        flat_labels[seed] = next_label
+        queue[0] = seed
+        head = 0
+        tail = 1
+        while head < tail:
+            cur = queue[head]
+            head += 1
+            for k in range(4):
+                idx = neighbors[cur, k]
+                if idx >= 0 and flat_board[idx] == 0 and flat_labels[idx] == -1:
+                    flat_labels[idx] = next_label
+                    queue[tail] = idx
+                    tail += 1
+        next_label += 1
+
+    return flat_labels.reshape(rows, cols), next_label
+
+
+if NUMBA_AVAILABLE:
+    bfs_path = njit(cache=True, nogil=True)(_bfs_path)
+    label_empty_components = njit(cache=True, nogil=True)(_label_empty_components)
+    # Warm the compile (disk-cached afterwards)
+    _warm_table = build_neighbor_table(9, 9)
+    bfs_path(np.zeros((9, 9), dtype=np.int8), _warm_table, 0, 0, 1, 1)
+    label_empty_components(np.zeros((9, 9), dtype=np.int8), _warm_table)
+else:
+    bfs_path = _bfs_path
+    label_empty_components = _label_empty_components
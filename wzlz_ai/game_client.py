@@ -6,6 +6,9 @@ and execute moves by simulating mouse clicks and keyboard input.
 """
 
 from typing import List, Optional, Tuple, Dict
+from concurrent.futures import ThreadPoolExecutor
+import ctypes
+from ctypes import wintypes
 import numpy as np
 import cv2
 import time
@@ -13,21 +16,53 @@ import json
 from pathlib import Path
 import sys
 
-# Add root directory to path for unified_capture
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
-try:
-    import win32gui
-    import win32api
-    import win32con
-    from unified_capture import capture_game_window, get_window_rect
-except ImportError:
-    print("Windows dependencies not installed!")
-    print("Install with: uv pip install pywin32")
-    raise
+# Win32 modules are loaded lazily: pywin32 pulls in several DLLs, and
+# deferring keeps this module importable (for type checks, rule queries
+# via SimulationEnvironment, CI) on hosts without the Windows stack.
+win32gui = None
+win32api = None
+win32con = None
+capture_game_window = None
+capture_window_region = None
+get_window_rect = None
+focus_window = None
+
+
+def _ensure_win32():
+    """Import the Win32 capture/input stack on first client use."""
+    global win32gui, win32api, win32con
+    global capture_game_window, capture_window_region, get_window_rect, focus_window
+
+    if win32gui is not None:
+        return
+
+    # Add root directory to path for unified_capture
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+
+    try:
+        import win32gui as _win32gui
+        import win32api as _win32api
+        import win32con as _win32con
+        from unified_capture import (capture_game_window as _capture_game_window,
+                                     capture_window_region as _capture_window_region,
+                                     get_window_rect as _get_window_rect,
+                                     focus_window as _focus_window)
+    except ImportError:
+        print("Windows dependencies not installed!")
+        print("Install with: uv pip install pywin32")
+        raise
+
+    win32gui = _win32gui
+    win32api = _win32api
+    win32con = _win32con
+    capture_game_window = _capture_game_window
+    capture_window_region = _capture_window_region
+    get_window_rect = _get_window_rect
+    focus_window = _focus_window
 
 from wzlz_ai.game_state import GameState, Move, MoveResult, Position, BallColor, GameConfig
 from wzlz_ai.game_environment import GameEnvironment
+from wzlz_ai._board_jit import classify_board, max_pair_mean_diff, NUMBA_AVAILABLE
 
 
 # Ball color samples (BGR format for OpenCV)
@@ -42,6 +77,113 @@ BALL_COLOR_SAMPLES = {
     BallColor.EMPTY: np.array([180, 180, 180]),
 }
 
+# HSV classification ranges per color (OpenCV hue runs 0-179).  The hue
+# bands are disjoint and the saturation floor rejects the gray board
+# background, so a cell matching no range is empty.
+BALL_COLOR_HSV_RANGES = {
+    BallColor.RED: ((0, 80, 80), (9, 255, 255)),
+    BallColor.BROWN: ((10, 80, 80), (22, 255, 255)),
+    BallColor.YELLOW: ((23, 80, 80), (40, 255, 255)),
+    BallColor.GREEN: ((45, 80, 80), (75, 255, 255)),
+    BallColor.CYAN: ((80, 80, 80), (100, 255, 255)),
+    BallColor.BLUE: ((105, 80, 80), (135, 255, 255)),
+    BallColor.MAGENTA: ((140, 80, 80), (165, 255, 255)),
+}
+
+# Hue-bin lookup table compiled from the ranges above: one int8 color
+# value per OpenCV hue (0-179), with unassigned bins left EMPTY.  Red
+# also claims the wrap-around band at the top of the hue circle.
+_S_MIN = 80
+_V_MIN = 80
+_HUE_TO_BALL = np.zeros(180, dtype=np.int8)
+for _color, ((_h_lo, _, _), (_h_hi, _, _)) in BALL_COLOR_HSV_RANGES.items():
+    _HUE_TO_BALL[_h_lo:_h_hi + 1] = int(_color)
+_HUE_TO_BALL[170:] = int(BallColor.RED)
+
+
+# SendInput structures for batched synthetic mouse/keyboard events
+_INPUT_MOUSE = 0
+_INPUT_KEYBOARD = 1
+_MOUSEEVENTF_MOVE = 0x0001
+_MOUSEEVENTF_LEFTDOWN = 0x0002
+_MOUSEEVENTF_LEFTUP = 0x0004
+_MOUSEEVENTF_ABSOLUTE = 0x8000
+_KEYEVENTF_KEYUP = 0x0002
+
+
+class _MOUSEINPUT(ctypes.Structure):
+    _fields_ = [
+        ('dx', ctypes.c_long),
+        ('dy', ctypes.c_long),
+        ('mouseData', wintypes.DWORD),
+        ('dwFlags', wintypes.DWORD),
+        ('time', wintypes.DWORD),
+        ('dwExtraInfo', ctypes.c_size_t),
+    ]
+
+
+class _KEYBDINPUT(ctypes.Structure):
+    _fields_ = [
+        ('wVk', wintypes.WORD),
+        ('wScan', wintypes.WORD),
+        ('dwFlags', wintypes.DWORD),
+        ('time', wintypes.DWORD),
+        ('dwExtraInfo', ctypes.c_size_t),
+    ]
+
+
+class _INPUTUNION(ctypes.Union):
+    _fields_ = [
+        ('mi', _MOUSEINPUT),
+        ('ki', _KEYBDINPUT),
+    ]
+
+
+class _INPUT(ctypes.Structure):
+    _anonymous_ = ('u',)
+    _fields_ = [
+        ('type', wintypes.DWORD),
+        ('u', _INPUTUNION),
+    ]
+
+
+def _send_click(x: int, y: int):
+    """
+    Move the cursor and click at screen coordinates with one SendInput call.
+
+    Packing move+down+up into a single batch removes the per-event syscalls
+    and sleeps of the SetCursorPos/mouse_event sequence.
+    """
+    # Normalize to the 0..65535 absolute coordinate space
+    screen_w = ctypes.windll.user32.GetSystemMetrics(0)
+    screen_h = ctypes.windll.user32.GetSystemMetrics(1)
+    nx = int(x * 65535 / max(screen_w - 1, 1))
+    ny = int(y * 65535 / max(screen_h - 1, 1))
+
+    events = (_INPUT * 3)()
+    events[0].type = _INPUT_MOUSE
+    events[0].mi.dx = nx
+    events[0].mi.dy = ny
+    events[0].mi.dwFlags = _MOUSEEVENTF_MOVE | _MOUSEEVENTF_ABSOLUTE
+    events[1].type = _INPUT_MOUSE
+    events[1].mi.dwFlags = _MOUSEEVENTF_LEFTDOWN
+    events[2].type = _INPUT_MOUSE
+    events[2].mi.dwFlags = _MOUSEEVENTF_LEFTUP
+
+    ctypes.windll.user32.SendInput(3, events, ctypes.sizeof(_INPUT))
+
+
+def _send_key(vk: int):
+    """Press and release a key with one batched SendInput call."""
+    events = (_INPUT * 2)()
+    events[0].type = _INPUT_KEYBOARD
+    events[0].ki.wVk = vk
+    events[1].type = _INPUT_KEYBOARD
+    events[1].ki.wVk = vk
+    events[1].ki.dwFlags = _KEYEVENTF_KEYUP
+
+    ctypes.windll.user32.SendInput(2, events, ctypes.sizeof(_INPUT))
+
 
 class GameClientEnvironment(GameEnvironment):
     """
@@ -62,10 +204,22 @@ class GameClientEnvironment(GameEnvironment):
             config_file: Path to calibration config file
         """
         super().__init__(config)
+        _ensure_win32()
         self.window_title = window_title
         self.config_file = config_file
         self.window_config: Optional[Dict] = None
         self._current_state = None
+        self._sim: Optional['SimulationEnvironment'] = None
+
+        # Dirty-check cache: skip reparsing when the board pixels are
+        # unchanged since the last read
+        self._last_board_hash: Optional[int] = None
+        self._last_state: Optional[GameState] = None
+
+        # Single capture worker so board reads can overlap the caller's
+        # policy inference between moves
+        self._capture_pool = ThreadPoolExecutor(max_workers=1)
+        self._pending_capture = None
 
         # Load calibration
         self.is_calibrated = self._load_calibration()
@@ -81,81 +235,112 @@ class GameClientEnvironment(GameEnvironment):
         try:
             with open(config_path, 'r') as f:
                 self.window_config = json.load(f)
+            self._build_coord_lut()
             return True
         except Exception as e:
             print(f"Error loading calibration: {e}")
             return False
 
-    def _color_distance(self, color1: np.ndarray, color2: np.ndarray) -> float:
-        """Calculate Euclidean distance between two colors."""
-        return np.linalg.norm(color1.astype(float) - color2.astype(float))
-
-    def _detect_ball_color(self, avg_color: np.ndarray) -> BallColor:
-        """Detect ball color from average cell color."""
-        best_match = BallColor.EMPTY
-        min_distance = float('inf')
-
-        for color_enum, sample_color in BALL_COLOR_SAMPLES.items():
-            distance = self._color_distance(avg_color, sample_color)
-            if distance < min_distance:
-                min_distance = distance
-                best_match = color_enum
-
-        return best_match
+    def _build_coord_lut(self):
+        """
+        Precompute window-relative click coordinates for every cell.
 
-    def _read_board_from_image(self, board_img: np.ndarray) -> np.ndarray:
-        """Read board state from board image."""
-        h, w = board_img.shape[:2]
-        cell_w = w / 9
-        cell_h = h / 9
+        _cell_to_screen_coords then reduces to one table lookup plus the
+        window origin instead of redoing the cell-center arithmetic.
+        """
+        bx, by, bw, bh = self.window_config['board_rect']
+        cell_w = bw / 9
+        cell_h = bh / 9
 
-        board = np.full((9, 9), BallColor.EMPTY, dtype=object)
+        # Cell centers plus the empirical click correction (see
+        # _cell_to_screen_coords); kept as floats so truncation happens
+        # after the window origin is added, matching the direct arithmetic
+        xs = bx + (np.arange(9) + 0.5) * cell_w + cell_w * 0.33
+        ys = by + (np.arange(9) + 0.5) * cell_h + cell_h * 1.5
 
-        for row in range(9):
-            for col in range(9):
-                # Sample center 50% of cell
-                x1 = int(col * cell_w + cell_w * 0.25)
-                y1 = int(row * cell_h + cell_h * 0.25)
-                x2 = int((col + 1) * cell_w - cell_w * 0.25)
-                y2 = int((row + 1) * cell_h - cell_h * 0.25)
+        self._coord_lut = np.empty((9, 9, 2), dtype=np.float64)
+        self._coord_lut[..., 0] = xs[None, :]
+        self._coord_lut[..., 1] = ys[:, None]
 
-                cell_region = board_img[y1:y2, x1:x2]
-                if cell_region.size > 0:
-                    avg_color = np.mean(cell_region, axis=(0, 1))
-                    board[row, col] = self._detect_ball_color(avg_color)
+    def _detect_ball_color(self, avg_color: np.ndarray) -> BallColor:
+        """Detect ball color from an average BGR cell color."""
+        pixel = np.asarray(avg_color, dtype=np.uint8).reshape(1, 1, 3)
+        h, s, v = cv2.cvtColor(pixel, cv2.COLOR_BGR2HSV)[0, 0]
+        if s < _S_MIN or v < _V_MIN:
+            return BallColor.EMPTY
+        return BallColor(int(_HUE_TO_BALL[h]))
 
-        return board
+    def _read_board_from_image(self, board_img: np.ndarray) -> np.ndarray:
+        """Read board state from board image as an int8 (9, 9) array."""
+        if NUMBA_AVAILABLE:
+            # One compiled nogil pass: cell means, HSV and hue lookup
+            # with no intermediate arrays
+            return classify_board(np.ascontiguousarray(board_img),
+                                  _HUE_TO_BALL, _S_MIN, _V_MIN, 9, 9)
+
+        # Area-interpolated downsample straight to one pixel per cell —
+        # a single SIMD call that yields the per-cell mean colors
+        means = cv2.resize(board_img, (9, 9), interpolation=cv2.INTER_AREA)
+
+        # Hue-bin table lookup over the 9x9 tensor; desaturated or dark
+        # cells (the board background) fall back to EMPTY.  The capture
+        # used to be channel-swapped before classification; treating the
+        # raw BGR capture as RGB here is the same mapping without the
+        # extra full-image cvtColor pass.
+        hsv = cv2.cvtColor(means, cv2.COLOR_RGB2HSV)
+        labels = _HUE_TO_BALL[hsv[..., 0]]
+        occupied = (hsv[..., 1] >= _S_MIN) & (hsv[..., 2] >= _V_MIN)
+        return np.where(occupied, labels, np.int8(0))
     
     def _capture_board_image(self) -> Optional[np.ndarray]:
         """Capture the board region from the game window."""
-        img = capture_game_window(self.window_title, bring_to_front=False)
-        if img is None:
+        x, y, w, h = self.window_config['board_rect']
+        board_img = capture_window_region(self.window_title, (x, y, w, h),
+                                          bring_to_front=False)
+        if board_img is None:
             return None
 
-        x, y, w, h = self.window_config['board_rect']
-        img_np = np.array(img)
-        board_img_bgr = cv2.cvtColor(img_np, cv2.COLOR_RGB2BGR)
-        board_img_bgr = board_img_bgr[y:y+h, x:x+w]
+        # Raw capture order; the classifier's HSV conversion absorbs the
+        # historical channel swap (see _read_board_from_image)
+        return np.asarray(board_img)
+
+    def _prefetch_board_image(self):
+        """Kick off a board capture on the worker thread."""
+        self._pending_capture = self._capture_pool.submit(self._capture_board_image)
 
-        return board_img_bgr
+    def _next_board_image(self) -> Optional[np.ndarray]:
+        """Get the prefetched board capture, or capture synchronously."""
+        future = self._pending_capture
+        if future is not None:
+            self._pending_capture = None
+            return future.result()
+        return self._capture_board_image()
 
     def _read_game_state(self) -> GameState:
         """Read the current game state from the window."""
-        board_img = self._capture_board_image()
+        board_img = self._next_board_image()
         if board_img is None:
             raise RuntimeError(f"Failed to capture window '{self.window_title}'")
 
-        board = self._read_board_from_image(board_img)
+        # Dirty check: hash a small downsample (robust to sub-pixel
+        # jitter) and skip the parse + OCR when nothing changed
+        thumb = cv2.resize(board_img, (16, 16), interpolation=cv2.INTER_AREA)
+        board_hash = hash(thumb.tobytes())
+        if board_hash == self._last_board_hash and self._last_state is not None:
+            return self._last_state.clone()
 
-        # Convert BallColor enums to int8 for GameState
-        board_int = np.zeros((9, 9), dtype=np.int8)
-        for row in range(9):
-            for col in range(9):
-                board_int[row, col] = board[row, col].value
+        board_int = self._read_board_from_image(board_img)
 
-        # Read score and next_balls using calibrated regions
-        score = self._read_current_score()
-        next_balls = self._read_next_balls()
+        # Read score and next_balls from one shared full-window capture
+        # instead of re-blitting the window once per region
+        score = 0
+        next_balls = []
+        if ('current_score_rect' in self.window_config
+                or 'next_balls_rect' in self.window_config):
+            window_img = capture_game_window(self.window_title, bring_to_front=False)
+            if window_img is not None:
+                score = self._read_current_score_from(window_img)
+                next_balls = self._read_next_balls_from(window_img)
 
         # Create game state
         state = GameState(
@@ -164,19 +349,17 @@ class GameClientEnvironment(GameEnvironment):
             next_balls=next_balls if next_balls else []
         )
 
-        return state
+        self._last_board_hash = board_hash
+        self._last_state = state
 
-    def _read_current_score(self) -> int:
-        """Read current score from the window using calibrated region."""
+        return state.clone()
+
+    def _read_current_score_from(self, img: np.ndarray) -> int:
+        """Read current score from a shared window capture."""
         if 'current_score_rect' not in self.window_config:
             return 0
 
         try:
-            # Capture full window
-            img = capture_game_window(self.window_title, bring_to_front=False)
-            if img is None:
-                return 0
-
             # Extract score region (img is BGR from unified_capture)
             x, y, w, h = self.window_config['current_score_rect']
             score_img = img[y:y+h, x:x+w]
@@ -186,17 +369,12 @@ class GameClientEnvironment(GameEnvironment):
         except Exception as e:
             return 0
 
-    def _read_next_balls(self) -> List[int]:
-        """Read next balls preview from the window using calibrated region."""
+    def _read_next_balls_from(self, img: np.ndarray) -> List[int]:
+        """Read next balls preview from a shared window capture."""
         if 'next_balls_rect' not in self.window_config:
             return []
 
         try:
-            # Capture full window
-            img = capture_game_window(self.window_title, bring_to_front=False)
-            if img is None:
-                return []
-
             # Extract next balls region (img is BGR from unified_capture)
             x, y, w, h = self.window_config['next_balls_rect']
             next_balls_img = img[y:y+h, x:x+w]
@@ -217,52 +395,45 @@ class GameClientEnvironment(GameEnvironment):
 
     def _detect_next_balls(self, next_balls_img: np.ndarray) -> List[BallColor]:
         """Detect next ball colors from preview region."""
-        # Divide into 3 regions (3 balls)
+        # Divide into 3 regions (3 balls); one reshape+mean yields all
+        # three average colors, one HSV conversion classifies them
         h, w = next_balls_img.shape[:2]
         ball_width = w // 3
 
-        next_balls = []
+        strips = next_balls_img[:, :3 * ball_width].reshape(h, 3, ball_width, -1)
+        means = strips.mean(axis=(0, 2)).astype(np.uint8).reshape(1, 3, -1)
 
-        for i in range(3):
-            x1 = i * ball_width
-            x2 = (i + 1) * ball_width
-            ball_region = next_balls_img[:, x1:x2]
+        hsv = cv2.cvtColor(means, cv2.COLOR_BGR2HSV)[0]
+        occupied = (hsv[:, 1] >= _S_MIN) & (hsv[:, 2] >= _V_MIN)
+        values = np.where(occupied, _HUE_TO_BALL[hsv[:, 0]], np.int8(0))
 
-            # Get average color (BGR)
-            avg_color = np.mean(ball_region, axis=(0, 1))
+        return [BallColor(int(v)) for v in values]
 
-            # Detect color
-            ball_color = self._detect_ball_color(avg_color)
-            next_balls.append(ball_color)
+    def _find_removed_balls(self, state_before: GameState,
+                            state_after: GameState) -> List[Position]:
+        """Find positions where balls disappeared between two states."""
+        removed_mask = (state_before.board != 0) & (state_after.board == 0)
+        rows, cols = np.where(removed_mask)
+        return [Position(int(r), int(c)) for r, c in zip(rows, cols)]
 
-        return next_balls
+    def _find_added_balls(self, state_before: GameState,
+                          state_after: GameState) -> List[Tuple[Position, BallColor]]:
+        """Find positions (and colors) where balls appeared between two states."""
+        added_mask = (state_before.board == 0) & (state_after.board != 0)
+        rows, cols = np.where(added_mask)
+        colors = state_after.board[added_mask]
+        return [(Position(int(r), int(c)), BallColor(int(v)))
+                for r, c, v in zip(rows, cols, colors)]
 
     def _bring_window_to_front(self):
         """Bring the game window to front and ensure it's focused."""
-        hwnd = win32gui.FindWindow(None, self.window_title)
-        if hwnd:
-            try:
-                if win32gui.IsIconic(hwnd):
-                    win32gui.ShowWindow(hwnd, 9)  # SW_RESTORE
-                    time.sleep(0.2)
-
-                # Try to set foreground window
-                # This may fail due to Windows restrictions, but that's okay
-                try:
-                    win32gui.SetForegroundWindow(hwnd)
-                except:
-                    # If SetForegroundWindow fails, try alternative method
-                    win32gui.ShowWindow(hwnd, 5)  # SW_SHOW
-                    win32gui.SetActiveWindow(hwnd)
-
-                time.sleep(0.3)
-                return True
-            except Exception as e:
-                # Even if we can't bring to front, continue
-                # The user might have the window focused already
-                time.sleep(0.3)
-                return True
-        return False
+        # focus_window resolves through unified_capture's validated hwnd
+        # cache, so this skips the O(window-count) FindWindow scan the
+        # old inline code paid on every call
+        if not focus_window(self.window_title):
+            return False
+        time.sleep(0.3)  # Let the window manager finish the switch
+        return True
 
     def _has_popup(self) -> bool:
         """
@@ -297,15 +468,11 @@ class GameClientEnvironment(GameEnvironment):
         VK_RETURN = 0x0D
 
         # First Enter - dismiss game over popup (if present)
-        win32api.keybd_event(VK_RETURN, 0, 0, 0)
-        time.sleep(0.05)
-        win32api.keybd_event(VK_RETURN, 0, 2, 0)  # KEYEVENTF_KEYUP
+        _send_key(VK_RETURN)
         time.sleep(0.8)
 
         # Second Enter - dismiss high score popup (if present)
-        win32api.keybd_event(VK_RETURN, 0, 0, 0)
-        time.sleep(0.05)
-        win32api.keybd_event(VK_RETURN, 0, 2, 0)  # KEYEVENTF_KEYUP
+        _send_key(VK_RETURN)
         time.sleep(0.8)
 
     def reset(self) -> GameState:
@@ -336,13 +503,14 @@ class GameClientEnvironment(GameEnvironment):
         # Just press Enter twice to dismiss both popups
         self._handle_popups()
 
-        # Wait for game to auto-restart after popups
-        time.sleep(1.0)
+        # Wait for the game to auto-restart after popups; returns as soon
+        # as the repopulated board stops changing
+        self._wait_for_stable_board(timeout=1.0)
 
         # Read state to check if game restarted
         try:
             state = self._read_game_state()
-            ball_count = sum(1 for row in range(9) for col in range(9) if state.board[row, col] != 0)
+            ball_count = int(np.count_nonzero(state.board))
 
             # If we have 5 balls, game restarted successfully
             if ball_count == 5:
@@ -357,12 +525,10 @@ class GameClientEnvironment(GameEnvironment):
 
         # Press F4 using keyboard events
         VK_F4 = 0x73
-        win32api.keybd_event(VK_F4, 0, 0, 0)
-        time.sleep(0.05)
-        win32api.keybd_event(VK_F4, 0, 2, 0)  # KEYEVENTF_KEYUP
+        _send_key(VK_F4)
 
         # Wait for game to reset
-        time.sleep(1.0)
+        self._wait_for_stable_board(timeout=1.0)
 
         # Read the new initial state
         self._current_state = self._read_game_state()
@@ -374,43 +540,87 @@ class GameClientEnvironment(GameEnvironment):
             raise RuntimeError("Game client not calibrated. Run examples/manual_calibrate_all.py first.")
 
         self._current_state = self._read_game_state()
+        self._current_state.board.setflags(write=False)
         return self._current_state.clone()
+
+    def get_state_readonly(self) -> GameState:
+        """
+        Read the current game state without the defensive clone.
+
+        The returned state's board is write-protected; callers that only
+        inspect it (search loops, rule queries) skip the per-read copy.
+        Use get_state() when you need a state you can mutate.
+        """
+        if not self.is_calibrated:
+            raise RuntimeError("Game client not calibrated. Run examples/manual_calibrate_all.py first.")
+
+        self._current_state = self._read_game_state()
+        self._current_state.board.setflags(write=False)
+        return self._current_state
     
-    def _cell_to_screen_coords(self, row: int, col: int) -> Tuple[int, int]:
-        """Convert board cell coordinates to screen coordinates."""
-        board_rect = self.window_config['board_rect']
-        window_rect = get_window_rect(self.window_title)
+    def _cell_to_screen_coords(self, row: int, col: int,
+                               window_rect: Optional[Tuple] = None) -> Tuple[int, int]:
+        """
+        Convert board cell coordinates to screen coordinates.
+
+        Pass window_rect when projecting several cells in a row so the
+        FindWindow/GetWindowRect round-trip happens once, not per cell.
+        """
+        if window_rect is None:
+            window_rect = get_window_rect(self.window_title)
 
         if not window_rect:
             raise RuntimeError(f"Window '{self.window_title}' not found")
 
-        bx, by, bw, bh = board_rect
-        window_left, window_top, window_right, window_bottom = window_rect
+        window_left, window_top = window_rect[0], window_rect[1]
 
-        cell_w = bw / 9
-        cell_h = bh / 9
+        # Precomputed cell center + click correction (from test_live_move.py)
+        x, y = self._coord_lut[row, col]
 
-        # Center of the cell
-        cell_center_x = bx + (col + 0.5) * cell_w
-        cell_center_y = by + (row + 0.5) * cell_h
+        return int(window_left + x), int(window_top + y)
 
-        # Apply correction (from test_live_move.py)
-        correction_x = cell_w * 0.33
-        correction_y = cell_h * 1.5
+    def _cells_to_screen_coords(self, positions: np.ndarray) -> np.ndarray:
+        """Convert an (n, 2) array of (row, col) cells to screen (x, y)."""
+        window_rect = get_window_rect(self.window_title)
 
-        screen_x = window_left + cell_center_x + correction_x
-        screen_y = window_top + cell_center_y + correction_y
+        if not window_rect:
+            raise RuntimeError(f"Window '{self.window_title}' not found")
 
-        return int(screen_x), int(screen_y)
+        coords = self._coord_lut[positions[:, 0], positions[:, 1]]
+        return (coords + np.array([window_rect[0], window_rect[1]])).astype(np.int64)
 
-    def _click_at(self, x: int, y: int):
-        """Click at screen coordinates."""
-        win32api.SetCursorPos((x, y))
-        time.sleep(0.1)
-        win32api.mouse_event(win32con.MOUSEEVENTF_LEFTDOWN, x, y, 0, 0)
-        time.sleep(0.05)
-        win32api.mouse_event(win32con.MOUSEEVENTF_LEFTUP, x, y, 0, 0)
-        time.sleep(0.1)
+    def _wait_for_stable_board(self, timeout: float, interval: float = 0.016,
+                               changed_from: Optional[np.ndarray] = None) -> bool:
+        """
+        Poll the board until two consecutive captures are identical.
+
+        Returns as soon as the move/new-ball animation has finished instead
+        of sleeping for the worst case.
+
+        Args:
+            timeout: Maximum time to wait in seconds
+            interval: Delay between polls in seconds (~one frame)
+            changed_from: Optional pre-move capture; when given, frames
+                still identical to it don't count as stable, so a slow
+                animation start can't satisfy the check early
+
+        Returns:
+            True if the board stabilized, False if the timeout expired
+        """
+        deadline = time.monotonic() + timeout
+        changed_bytes = None if changed_from is None else changed_from.tobytes()
+        last = None
+        while time.monotonic() < deadline:
+            img = self._capture_board_image()
+            if img is None:
+                last = None
+            else:
+                raw = img.tobytes()
+                if raw != changed_bytes and raw == last:
+                    return True
+                last = raw
+            time.sleep(interval)
+        return False
 
     def _is_cell_selected(self, row: int, col: int, debug: bool = False) -> bool:
         """
@@ -434,20 +644,28 @@ class GameClientEnvironment(GameEnvironment):
             img = self._get_cell_image(row, col)
             if img is None:
                 return False
-            images.append(img)
+            # Copy: the cell image is a view into the capture backend's
+            # frame, and a backend reusing its buffer would otherwise
+            # leave all five entries aliasing the last capture
+            images.append(img.copy())
             time.sleep(0.02)  # Very short delay (20ms) for rapid capture
 
         # Compare all pairs of images
-        max_diff = 0
-        for i in range(len(images)):
-            for j in range(i + 1, len(images)):
-                # Calculate pixel-wise difference
-                diff = np.abs(images[i].astype(float) - images[j].astype(float))
-                mean_diff = np.mean(diff)
-                max_diff = max(max_diff, mean_diff)
+        if NUMBA_AVAILABLE:
+            # One compiled pass over the stacked captures, no per-pair
+            # float temporaries
+            max_diff = max_pair_mean_diff(np.stack(images))
+        else:
+            max_diff = 0
+            for i in range(len(images)):
+                for j in range(i + 1, len(images)):
+                    # Calculate pixel-wise difference
+                    diff = np.abs(images[i].astype(float) - images[j].astype(float))
+                    mean_diff = np.mean(diff)
+                    max_diff = max(max_diff, mean_diff)
 
-                if debug:
-                    print(f"  Image {i} vs {j}: mean diff = {mean_diff:.2f}")
+                    if debug:
+                        print(f"  Image {i} vs {j}: mean diff = {mean_diff:.2f}")
 
         if debug:
             print(f"  Max difference: {max_diff:.2f}")
@@ -529,21 +747,30 @@ class GameClientEnvironment(GameEnvironment):
 
         # Get state before move
         state_before = self._read_game_state()
-        ball_count_before = sum(1 for row in range(9) for col in range(9) if state_before.board[row, col] != 0)
+        ball_count_before = int(np.count_nonzero(state_before.board))
+
+        # Get screen coordinates; the window can't move mid-move, so one
+        # rect lookup covers both clicks
+        window_rect = get_window_rect(self.window_title)
+        from_x, from_y = self._cell_to_screen_coords(move.from_pos.row, move.from_pos.col,
+                                                     window_rect)
+        to_x, to_y = self._cell_to_screen_coords(move.to_pos.row, move.to_pos.col,
+                                                 window_rect)
 
-        # Get screen coordinates
-        from_x, from_y = self._cell_to_screen_coords(move.from_pos.row, move.from_pos.col)
-        to_x, to_y = self._cell_to_screen_coords(move.to_pos.row, move.to_pos.col)
+        # Snapshot the pre-move pixels so the stability wait below can't
+        # trigger before the move animation has visibly started
+        before_img = self._capture_board_image()
 
-        # Click on source ball to select it
-        self._click_at(from_x, from_y)
+        # Click on source ball to select it (one batched SendInput call)
+        _send_click(from_x, from_y)
         time.sleep(0.3)  # Wait for bounce animation
 
         # Click on destination to move
-        self._click_at(to_x, to_y)
+        _send_click(to_x, to_y)
 
-        # Wait for move animation + new balls
-        time.sleep(1.8)
+        # Wait for move animation + new balls; returns as soon as two
+        # consecutive frames match instead of sleeping the worst case
+        self._wait_for_stable_board(timeout=1.8, changed_from=before_img)
 
         # Press Enter twice to dismiss any popups
         # If there's no popup, pressing Enter does nothing during gameplay
@@ -551,20 +778,29 @@ class GameClientEnvironment(GameEnvironment):
         VK_RETURN = 0x0D
 
         # First Enter - dismiss game over popup (if present)
-        win32api.keybd_event(VK_RETURN, 0, 0, 0)
-        time.sleep(0.05)
-        win32api.keybd_event(VK_RETURN, 0, 2, 0)  # KEYEVENTF_KEYUP
+        _send_key(VK_RETURN)
         time.sleep(0.8)
 
         # Second Enter - dismiss high score popup (if present)
-        win32api.keybd_event(VK_RETURN, 0, 0, 0)
-        time.sleep(0.05)
-        win32api.keybd_event(VK_RETURN, 0, 2, 0)  # KEYEVENTF_KEYUP
+        _send_key(VK_RETURN)
         time.sleep(0.8)
 
         # Read new state
         state_after = self._read_game_state()
-        ball_count_after = sum(1 for row in range(9) for col in range(9) if state_after.board[row, col] != 0)
+
+        # The board is static until the next move, so start capturing now;
+        # the caller's next get_state() consumes this frame while it thinks
+        self._prefetch_board_image()
+
+        # Unchanged board means the click didn't register — short-circuit
+        # before the reset check and diffs, none of which can apply
+        if state_before.board.tobytes() == state_after.board.tobytes():
+            return MoveResult(
+                success=False,
+                error_message="Move was not executed by the game"
+            )
+
+        ball_count_after = int(np.count_nonzero(state_after.board))
 
         # Check if game reset (ball count dropped to 5)
         if ball_count_before > 50 and ball_count_after == 5:
@@ -572,24 +808,22 @@ class GameClientEnvironment(GameEnvironment):
             self._current_state = state_after
             return None  # Signal that game reset occurred
 
-        # Determine if move was successful by comparing states
-        success = not np.array_equal(state_before.board, state_after.board)
-
-        if success:
-            self._current_state = state_after
-
-            return MoveResult(
-                success=True,
-                new_state=state_after.clone(),
-                balls_removed=[],  # TODO: Calculate
-                points_earned=0,  # TODO: Read from screen
-                new_balls_added=[]  # TODO: Calculate
-            )
-        else:
-            return MoveResult(
-                success=False,
-                error_message="Move was not executed by the game"
-            )
+        self._current_state = state_after
+
+        # Diff the boards; the moved ball itself isn't a removal/addition
+        balls_removed = [pos for pos in self._find_removed_balls(state_before, state_after)
+                         if pos != move.from_pos]
+        new_balls_added = [(pos, color) for pos, color
+                           in self._find_added_balls(state_before, state_after)
+                           if pos != move.to_pos]
+
+        return MoveResult(
+            success=True,
+            new_state=state_after.clone(),
+            balls_removed=balls_removed,
+            points_earned=0,  # TODO: Read from screen
+            new_balls_added=new_balls_added
+        )
     
     def get_valid_moves(self, state: Optional[GameState] = None) -> List[Move]:
         """
@@ -599,22 +833,27 @@ class GameClientEnvironment(GameEnvironment):
         but operates on the state read from the game client.
         """
         if state is None:
-            state = self.get_state()
-        
+            state = self.get_state_readonly()
+
         # Use the same logic as simulation environment
-        from wzlz_ai.game_environment import SimulationEnvironment
-        sim_env = SimulationEnvironment(self.config)
+        sim_env = self._get_sim()
         sim_env._current_state = state
         return sim_env.get_valid_moves(state)
-    
+
     def is_path_clear(self, from_pos: Position, to_pos: Position,
                      state: Optional[GameState] = None) -> Tuple[bool, List[Position]]:
         """Check if path is clear using simulation logic."""
         if state is None:
-            state = self.get_state()
+            state = self.get_state_readonly()
 
-        from wzlz_ai.game_environment import SimulationEnvironment
-        sim_env = SimulationEnvironment(self.config)
+        sim_env = self._get_sim()
         sim_env._current_state = state
         return sim_env.is_path_clear(from_pos, to_pos, state)
 
+    def _get_sim(self) -> 'SimulationEnvironment':
+        """Get the memoized simulation environment used for rule queries."""
+        if self._sim is None:
+            from wzlz_ai.game_environment import SimulationEnvironment
+            self._sim = SimulationEnvironment(self.config)
+        return self._sim
+
@@ -10,6 +10,12 @@ from typing import List, Optional, Tuple
 import numpy as np
 
 from wzlz_ai.game_state import GameState, Move, MoveResult, Position, BallColor, GameConfig
+from wzlz_ai._pathfind_nb import bfs_path, build_neighbor_table, label_empty_components
+from wzlz_ai._match_nb import make_match_kernel
+
+# Plain int for board comparisons in internal code; BallColor is only
+# constructed at API boundaries
+_EMPTY = int(BallColor.EMPTY)
 
 
 class GameEnvironment(ABC):
@@ -105,9 +111,18 @@ class GameEnvironment(ABC):
         """
         if state is None:
             state = self.get_state()
-        
-        # Game is over if there are no valid moves
-        return len(self.get_valid_moves(state)) == 0
+
+        # A move exists iff some ball borders an empty cell (it can then
+        # step into that cell's component), so there is no need to
+        # enumerate the moves themselves
+        occupied = state.board != _EMPTY
+        if not occupied.any():
+            return True
+        empty = ~occupied
+        return not ((occupied[:, 1:] & empty[:, :-1]).any()
+                    or (occupied[:, :-1] & empty[:, 1:]).any()
+                    or (occupied[1:, :] & empty[:-1, :]).any()
+                    or (occupied[:-1, :] & empty[1:, :]).any())
     
     @property
     def current_state(self) -> GameState:
@@ -134,7 +149,11 @@ class SimulationEnvironment(GameEnvironment):
         super().__init__(config)
         self.rng = np.random.RandomState(seed)
         self._current_state = None
-    
+        self._last_undo = None
+        self._neighbors = build_neighbor_table(config.rows, config.cols)
+        self._match_kernel = make_match_kernel(config.rows, config.cols,
+                                               config.match_length)
+
     def reset(self) -> GameState:
         """Reset the game to initial state."""
         # Create empty board
@@ -150,77 +169,125 @@ class SimulationEnvironment(GameEnvironment):
             state.next_balls = []
 
         self._current_state = state
+        self._last_undo = None
         return state.clone()
     
-    def get_state(self) -> GameState:
-        """Get the current game state."""
+    def get_state(self, copy: bool = False) -> GameState:
+        """
+        Get the current game state.
+
+        By default this returns the live state object, which later
+        execute_move calls mutate in place; pass copy=True for a
+        snapshot that stays fixed.
+        """
         if self._current_state is None:
             return self.reset()
-        return self._current_state.clone()
+        if copy:
+            return self._current_state.clone()
+        return self._current_state
     
-    def execute_move(self, move: Move) -> MoveResult:
-        """Execute a move in the simulation."""
+    def execute_move(self, move: Move, clone: bool = True) -> MoveResult:
+        """
+        Execute a move in the simulation.
+
+        The board is mutated in place and an undo delta is recorded
+        instead of deep-copying the state per move; the record is kept
+        on self._last_undo so search code can roll the move back with
+        undo_last_move(). Pass clone=False to get the live state in the
+        result instead of a defensive copy.
+        """
         state = self._current_state
-        
+        cols = state.cols
+
         # Validate move
         if not state.is_valid_position(move.from_pos) or not state.is_valid_position(move.to_pos):
             return MoveResult(success=False, error_message="Invalid position")
-        
+
         if state.is_empty(move.from_pos):
             return MoveResult(success=False, error_message="No ball at source position")
-        
+
         if not state.is_empty(move.to_pos):
             return MoveResult(success=False, error_message="Target position is occupied")
-        
-        # Check if path is clear
-        path_exists, path = self.is_path_clear(move.from_pos, move.to_pos, state)
-        if not path_exists:
+
+        # Check if path is clear (kept in flat indices for the result)
+        path_flat = bfs_path(state.board, self._neighbors,
+                             move.from_pos.row, move.from_pos.col,
+                             move.to_pos.row, move.to_pos.col)
+        if path_flat.size == 0:
             return MoveResult(success=False, error_message="No clear path to target")
-        
-        # Create new state
-        new_state = state.clone()
-        new_state.move_count += 1
-        
-        # Move the ball
-        ball_color = new_state.get_cell(move.from_pos)
-        new_state.set_cell(move.to_pos, ball_color)
-        new_state.set_cell(move.from_pos, BallColor.EMPTY)
+        path = [Position(int(f) // cols, int(f) % cols) for f in path_flat]
+
+        # Move the ball and snapshot the bookkeeping for undo
+        record = state.apply_move_inplace(move)
 
         # Check for matches at destination (earns 2 points per ball)
-        balls_removed, num_removed = self._check_and_remove_matches(new_state, move.to_pos)
+        balls_removed, num_removed = self._check_and_remove_matches(state, move.to_pos)
+        record.removed = [(p.row * cols + p.col, record.color) for p in balls_removed]
         points_earned = num_removed * 2  # 2 points per ball
 
         # Add new balls if no match was made
         new_balls_added = []
         if not balls_removed:
-            new_balls_added = self._add_next_balls(new_state)
-            # Check for matches from newly added balls (no points earned)
-            auto_removed, _ = self._check_all_matches(new_state)
+            new_balls_added = self._add_next_balls(state)
+            record.added = [p.row * cols + p.col for p, _ in new_balls_added]
+            # The board was match-free before the spawn, so only lines
+            # through the spawned balls can newly match (no points
+            # earned). The snapshot is post-spawn, so a spawned ball
+            # that auto-matched lands in both record.removed (with its
+            # spawned color) and record.added; undo nets the overlap
+            # out by restoring removed before clearing added
+            board_before = state.board.copy()
+            auto_removed, _ = self._check_all_matches(
+                state, positions=[p for p, _ in new_balls_added])
+            record.removed.extend(
+                (p.row * cols + p.col, int(board_before[p.row, p.col]))
+                for p in auto_removed)
             balls_removed.extend(auto_removed)
-            # Note: auto_removed balls don't earn points
 
         # Update score (only from player's move matches, not auto-matches)
-        new_state.score += points_earned
+        state.score += points_earned
+        record.score_delta = points_earned
 
         # Generate next balls (only if enabled)
         if self.config.show_next_balls:
-            new_state.next_balls = self._generate_next_balls()
+            state.next_balls = self._generate_next_balls()
         else:
-            new_state.next_balls = []
+            state.next_balls = []
 
         # Check if game is over
-        new_state.game_over = self.is_game_over(new_state)
-        
-        self._current_state = new_state
-        
+        state.game_over = self.is_game_over(state)
+
+        self._last_undo = record
+
         return MoveResult(
             success=True,
-            new_state=new_state.clone(),
+            new_state=state.clone() if clone else state,
             balls_removed=balls_removed,
             points_earned=points_earned,
             new_balls_added=new_balls_added,
-            path=path
+            path=path,
+            balls_removed_idx=np.fromiter(
+                (f for f, _ in record.removed), dtype=np.int32,
+                count=len(record.removed)),
+            new_balls_added_idx=np.asarray(record.added, dtype=np.int32),
+            path_idx=path_flat
         )
+
+    def undo_last_move(self) -> bool:
+        """
+        Roll back the most recent successful execute_move.
+
+        Note: this restores the game state exactly, but not the RNG —
+        replaying the same move will draw fresh ball placements.
+
+        Returns:
+            True if a move was undone, False if there was nothing to undo.
+        """
+        if self._last_undo is None:
+            return False
+        self._current_state.undo(self._last_undo)
+        self._last_undo = None
+        return True
     
     def get_valid_moves(self, state: Optional[GameState] = None) -> List[Move]:
         """Get all valid moves from the current state."""
@@ -228,16 +295,46 @@ class SimulationEnvironment(GameEnvironment):
             state = self._current_state
         
         valid_moves = []
-        occupied = state.get_occupied_positions()
-        empty = state.get_empty_positions()
-        
-        # For each ball, find all reachable empty positions
-        for from_pos in occupied:
-            for to_pos in empty:
-                path_exists, _ = self.is_path_clear(from_pos, to_pos, state)
-                if path_exists:
-                    valid_moves.append(Move(from_pos, to_pos))
-        
+        board = state.board
+        rows, cols = board.shape
+
+        # Label the empty cells into connected components once; a ball
+        # can reach exactly the components touching its 4 neighbors, so
+        # no per-ball flood fill is needed at all
+        labels, n_components = label_empty_components(board, self._neighbors)
+        if n_components == 0:
+            return valid_moves
+
+        flat_labels = labels.ravel()
+        component_cells = [np.flatnonzero(flat_labels == label)
+                           for label in range(n_components)]
+        component_positions = [
+            [Position(int(f) // cols, int(f) % cols) for f in cells]
+            for cells in component_cells
+        ]
+
+        for fr, fc in np.argwhere(board != 0):
+            fr = int(fr)
+            fc = int(fc)
+            adjacent = {int(labels[nr, nc])
+                        for nr, nc in ((fr, fc + 1), (fr + 1, fc),
+                                       (fr, fc - 1), (fr - 1, fc))
+                        if 0 <= nr < rows and 0 <= nc < cols
+                        and labels[nr, nc] >= 0}
+            if not adjacent:
+                continue
+
+            from_pos = Position(fr, fc)
+            if len(adjacent) == 1:
+                targets = component_positions[adjacent.pop()]
+            else:
+                # Components are disjoint, so sorting the concatenated
+                # flat indices restores the row-major target order
+                merged = np.sort(np.concatenate(
+                    [component_cells[label] for label in adjacent]))
+                targets = [Position(int(f) // cols, int(f) % cols) for f in merged]
+            valid_moves.extend(Move(from_pos, to_pos) for to_pos in targets)
+
         return valid_moves
     
     def is_path_clear(self, from_pos: Position, to_pos: Position,
@@ -245,82 +342,69 @@ class SimulationEnvironment(GameEnvironment):
         """Check if there's a clear path using BFS."""
         if state is None:
             state = self._current_state
-        
-        # BFS to find path
-        from collections import deque
-        
-        queue = deque([(from_pos, [from_pos])])
-        visited = {from_pos}
-        
-        while queue:
-            current, path = queue.popleft()
-            
-            if current == to_pos:
-                return True, path
-            
-            # Check all 4 directions
-            for dr, dc in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                next_pos = Position(current.row + dr, current.col + dc)
-                
-                if (state.is_valid_position(next_pos) and 
-                    next_pos not in visited and
-                    (state.is_empty(next_pos) or next_pos == to_pos)):
-                    
-                    visited.add(next_pos)
-                    queue.append((next_pos, path + [next_pos]))
-        
-        return False, []
+
+        # Flat-index BFS with parent pointers; Position objects are only
+        # built for the returned path
+        path_flat = bfs_path(state.board, self._neighbors,
+                             from_pos.row, from_pos.col,
+                             to_pos.row, to_pos.col)
+        if path_flat.size == 0:
+            return False, []
+
+        cols = state.cols
+        return True, [Position(int(f) // cols, int(f) % cols) for f in path_flat]
     
     def _generate_next_balls(self) -> List[BallColor]:
         """Generate the next set of balls."""
-        valid_colors = BallColor.get_valid_colors()[:self.config.colors_count]
-        return [BallColor(self.rng.choice(valid_colors)) 
-                for _ in range(self.config.balls_per_turn)]
+        drawn = self.rng.choice(self.config._valid_colors_arr,
+                                size=self.config.balls_per_turn)
+        return [BallColor(int(v)) for v in drawn]
     
     def _add_random_balls(self, state: GameState, count: int) -> List[Tuple[Position, BallColor]]:
         """Add random balls to empty positions."""
-        empty_positions = state.get_empty_positions()
-        
-        if len(empty_positions) < count:
-            count = len(empty_positions)
-        
+        flat_board = state.board.ravel()
+        empty_flat = np.flatnonzero(flat_board == _EMPTY)
+
+        if empty_flat.size < count:
+            count = empty_flat.size
+
         if count == 0:
             return []
-        
-        selected_positions = self.rng.choice(len(empty_positions), count, replace=False)
-        valid_colors = BallColor.get_valid_colors()[:self.config.colors_count]
-        
+
+        selected = self.rng.choice(empty_flat.size, count, replace=False)
+        drawn = self.rng.choice(self.config._valid_colors_arr, size=count)
+        cols = state.cols
+
         added_balls = []
-        for idx in selected_positions:
-            pos = empty_positions[idx]
-            color = BallColor(self.rng.choice(valid_colors))
-            state.set_cell(pos, color)
-            added_balls.append((pos, color))
-        
+        for idx, value in zip(selected, drawn):
+            f = int(empty_flat[idx])
+            color = BallColor(int(value))
+            flat_board[f] = int(color)
+            added_balls.append((Position(f // cols, f % cols), color))
+
         return added_balls
-    
+
     def _add_next_balls(self, state: GameState) -> List[Tuple[Position, BallColor]]:
         """Add the previewed next balls to the board."""
-        empty_positions = state.get_empty_positions()
-        
-        if len(empty_positions) < len(state.next_balls):
-            # Not enough space, add what we can
-            count = len(empty_positions)
-        else:
-            count = len(state.next_balls)
-        
+        flat_board = state.board.ravel()
+        empty_flat = np.flatnonzero(flat_board == _EMPTY)
+
+        # Not enough space: add what we can
+        count = min(empty_flat.size, len(state.next_balls))
+
         if count == 0:
             return []
-        
-        selected_positions = self.rng.choice(len(empty_positions), count, replace=False)
-        
+
+        selected = self.rng.choice(empty_flat.size, count, replace=False)
+        cols = state.cols
+
         added_balls = []
-        for i, idx in enumerate(selected_positions):
-            pos = empty_positions[idx]
+        for i, idx in enumerate(selected):
+            f = int(empty_flat[idx])
             color = state.next_balls[i]
-            state.set_cell(pos, color)
-            added_balls.append((pos, color))
-        
+            flat_board[f] = int(color)
+            added_balls.append((Position(f // cols, f % cols), color))
+
         return added_balls
     
     def _check_and_remove_matches(self, state: GameState, pos: Position) -> Tuple[List[Position], int]:
@@ -341,103 +425,106 @@ class SimulationEnvironment(GameEnvironment):
             # Check entire board for matches
             return self._check_all_matches(state)
 
-        color = state.get_cell(pos)
-        if color == BallColor.EMPTY:
+        flat = self._match_kernel(state.board, pos.row, pos.col)
+        if flat.size == 0:
             return [], 0
 
-        all_matches = set()
-
-        # Define 4 directions: horizontal, vertical, diagonal-right, diagonal-left
-        directions = [
-            (0, 1),   # Horizontal
-            (1, 0),   # Vertical
-            (1, 1),   # Diagonal (top-left to bottom-right)
-            (1, -1),  # Diagonal (top-right to bottom-left)
-        ]
+        cols = self.config.cols
+        state.board.ravel()[flat] = _EMPTY
+        matched = [Position(int(f) // cols, int(f) % cols) for f in flat]
+        return matched, len(matched)
 
-        for dr, dc in directions:
-            line = self._get_line_in_direction(state, pos, dr, dc, color)
-            if len(line) >= self.config.match_length:
-                all_matches.update(line)
-
-        # Remove matched balls
-        if all_matches:
-            for match_pos in all_matches:
-                state.set_cell(match_pos, BallColor.EMPTY)
-
-        return list(all_matches), len(all_matches)
-
-    def _get_line_in_direction(self, state: GameState, pos: Position,
-                               dr: int, dc: int, color: BallColor) -> List[Position]:
+    def _match_mask(self, board: np.ndarray) -> np.ndarray:
         """
-        Get all consecutive balls of the same color in a given direction.
-
-        Args:
-            state: Current game state
-            pos: Starting position
-            dr: Row direction (-1, 0, or 1)
-            dc: Column direction (-1, 0, or 1)
-            color: Color to match
+        Boolean mask of every cell belonging to a match, board-wide.
 
-        Returns:
-            List of positions forming a line in both directions
+        For each color present, a run start is found by AND-ing the color
+        mask with itself shifted along the direction match_length times,
+        then expanded back over the run; runs longer than match_length are
+        covered by their overlapping starts.
         """
-        line = [pos]
-
-        # Check in positive direction
-        r, c = pos.row + dr, pos.col + dc
-        while (0 <= r < state.rows and 0 <= c < state.cols and
-               state.board[r, c] == color):
-            line.append(Position(r, c))
-            r += dr
-            c += dc
-
-        # Check in negative direction
-        r, c = pos.row - dr, pos.col - dc
-        while (0 <= r < state.rows and 0 <= c < state.cols and
-               state.board[r, c] == color):
-            line.append(Position(r, c))
-            r -= dr
-            c -= dc
-
-        return line
-
-    def _check_all_matches(self, state: GameState) -> Tuple[List[Position], int]:
+        m = self.config.match_length
+        rows, cols = board.shape
+        remove_mask = np.zeros((rows, cols), dtype=bool)
+        h = rows - m + 1
+        w = cols - m + 1
+
+        for color in np.unique(board):
+            if color == _EMPTY:
+                continue
+            M = board == color
+
+            if w > 0:
+                # Horizontal
+                starts = M[:, 0:w].copy()
+                for k in range(1, m):
+                    starts &= M[:, k:k + w]
+                for k in range(m):
+                    remove_mask[:, k:k + w] |= starts
+
+            if h > 0:
+                # Vertical
+                starts = M[0:h, :].copy()
+                for k in range(1, m):
+                    starts &= M[k:k + h, :]
+                for k in range(m):
+                    remove_mask[k:k + h, :] |= starts
+
+            if h > 0 and w > 0:
+                # Diagonal (down-right)
+                starts = M[0:h, 0:w].copy()
+                for k in range(1, m):
+                    starts &= M[k:k + h, k:k + w]
+                for k in range(m):
+                    remove_mask[k:k + h, k:k + w] |= starts
+
+                # Anti-diagonal (down-left)
+                starts = M[0:h, m - 1:m - 1 + w].copy()
+                for k in range(1, m):
+                    starts &= M[k:k + h, m - 1 - k:m - 1 - k + w]
+                for k in range(m):
+                    remove_mask[k:k + h, m - 1 - k:m - 1 - k + w] |= starts
+
+        return remove_mask
+
+    def _check_all_matches(self, state: GameState,
+                           positions: Optional[List[Position]] = None) -> Tuple[List[Position], int]:
         """
-        Check the entire board for matches.
-        Used after adding random balls to check for automatic eliminations.
+        Check the board for matches and remove them.
+
+        When positions is given only lines through those cells are
+        scanned (enough when they are the only cells that changed on a
+        previously match-free board); otherwise the entire board is
+        swept. Used after adding random balls to check for automatic
+        eliminations.
 
         Returns:
             Tuple of (list of positions to remove, number of balls removed)
         """
-        all_matches = set()
-
-        # Check each occupied position
-        for row in range(state.rows):
-            for col in range(state.cols):
-                pos = Position(row, col)
-                color = state.get_cell(pos)
-
-                if color == BallColor.EMPTY:
-                    continue
-
-                # Check all 4 directions from this position
-                directions = [
-                    (0, 1),   # Horizontal
-                    (1, 0),   # Vertical
-                    (1, 1),   # Diagonal (top-left to bottom-right)
-                    (1, -1),  # Diagonal (top-right to bottom-left)
-                ]
-
-                for dr, dc in directions:
-                    line = self._get_line_in_direction(state, pos, dr, dc, color)
-                    if len(line) >= self.config.match_length:
-                        all_matches.update(line)
-
-        # Remove matched balls
-        if all_matches:
-            for match_pos in all_matches:
-                state.set_cell(match_pos, BallColor.EMPTY)
-
-        return list(all_matches), len(all_matches)
+        if positions is not None:
+            # Detect through every changed cell first, then remove the
+            # union: matches that share cells are still removed
+            # simultaneously, exactly as the full sweep would
+            matched_flat = set()
+            for pos in positions:
+                flat = self._match_kernel(state.board, pos.row, pos.col)
+                matched_flat.update(int(f) for f in flat)
+            if not matched_flat:
+                return [], 0
+
+            cols = state.cols
+            flat_board = state.board.ravel()
+            matched = []
+            for f in sorted(matched_flat):
+                flat_board[f] = _EMPTY
+                matched.append(Position(f // cols, f % cols))
+            return matched, len(matched)
+
+        remove_mask = self._match_mask(state.board)
+        if not remove_mask.any():
+            return [], 0
+
+        matched = [Position(int(r), int(c)) for r, c in np.argwhere(remove_mask)]
+        state.board[remove_mask] = _EMPTY
+        return matched, len(matched)
 
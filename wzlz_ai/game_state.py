@@ -32,6 +32,9 @@ class BallColor(IntEnum):
 @dataclass
 class Position:
     """Represents a position on the game board."""
+    # Slots keep the many short-lived positions built per move small and
+    # their attribute access cheap
+    __slots__ = ('row', 'col')
     row: int
     col: int
     
@@ -54,6 +57,7 @@ class Position:
 @dataclass
 class Move:
     """Represents a move in the game."""
+    __slots__ = ('from_pos', 'to_pos')
     from_pos: Position
     to_pos: Position
     
@@ -61,6 +65,39 @@ class Move:
         return f"Move({self.from_pos} -> {self.to_pos})"
 
 
+@dataclass
+class UndoRecord:
+    """
+    Delta needed to reverse one applied move.
+
+    Cells are stored as flat board indices (row * cols + col); the
+    environment fills in removals, additions and the score delta as it
+    mutates the state further after apply_move_inplace.
+
+    Attributes:
+        src: Flat index the ball moved from
+        dst: Flat index the ball moved to
+        color: Color of the moved ball
+        removed: (flat_index, color) pairs of balls removed by matches;
+            may overlap added when a spawned ball auto-matched, in
+            which case undo() leaves the cell EMPTY
+        added: Flat indices of balls spawned after the move
+        score_delta: Points added to the score by this move
+        prev_next_balls: next_balls list before the move
+        prev_move_count: move_count before the move
+        prev_game_over: game_over flag before the move
+    """
+    src: int
+    dst: int
+    color: int
+    removed: List[Tuple[int, int]] = field(default_factory=list)
+    added: List[int] = field(default_factory=list)
+    score_delta: int = 0
+    prev_next_balls: List[BallColor] = field(default_factory=list)
+    prev_move_count: int = 0
+    prev_game_over: bool = False
+
+
 @dataclass
 class GameState:
     """
@@ -107,10 +144,40 @@ class GameState:
     def set_cell(self, pos: Position, color: BallColor) -> None:
         """Set the ball color at a specific position."""
         self.board[pos.row, pos.col] = int(color)
+
+    def set_row(self, row: int, col_start: int, col_end: int, color: BallColor) -> None:
+        """Fill part of a row with one color (col_end is exclusive)."""
+        self.board[row, col_start:col_end] = int(color)
+
+    def set_col(self, col: int, row_start: int, row_end: int, color: BallColor) -> None:
+        """Fill part of a column with one color (row_end is exclusive)."""
+        self.board[row_start:row_end, col] = int(color)
+
+    def set_diag(self, row: int, col: int, length: int, color: BallColor) -> None:
+        """Fill a down-right diagonal starting at (row, col) with one color."""
+        steps = np.arange(length)
+        self.board[row + steps, col + steps] = int(color)
+
+    def clear(self) -> None:
+        """Remove all balls from the board."""
+        self.board.fill(int(BallColor.EMPTY))
     
     def is_empty(self, pos: Position) -> bool:
         """Check if a position is empty."""
-        return self.get_cell(pos) == BallColor.EMPTY
+        return self.board[pos.row, pos.col] == int(BallColor.EMPTY)
+
+    @property
+    def empty_mask(self) -> np.ndarray:
+        """Boolean mask of empty cells (rows x cols)."""
+        return self.board == int(BallColor.EMPTY)
+
+    def empties(self) -> np.ndarray:
+        """Coordinates of empty cells as an (n, 2) array of (row, col)."""
+        return np.argwhere(self.board == int(BallColor.EMPTY))
+
+    def nonempties(self) -> np.ndarray:
+        """Coordinates of occupied cells as an (n, 2) array of (row, col)."""
+        return np.argwhere(self.board != int(BallColor.EMPTY))
     
     def is_valid_position(self, pos: Position) -> bool:
         """Check if a position is within board bounds."""
@@ -118,24 +185,57 @@ class GameState:
     
     def get_empty_positions(self) -> List[Position]:
         """Get all empty positions on the board."""
-        empty_positions = []
-        for row in range(self.rows):
-            for col in range(self.cols):
-                pos = Position(row, col)
-                if self.is_empty(pos):
-                    empty_positions.append(pos)
-        return empty_positions
-    
+        return [Position(int(r), int(c)) for r, c in self.empties()]
+
     def get_occupied_positions(self) -> List[Position]:
         """Get all positions with balls."""
-        occupied_positions = []
-        for row in range(self.rows):
-            for col in range(self.cols):
-                pos = Position(row, col)
-                if not self.is_empty(pos):
-                    occupied_positions.append(pos)
-        return occupied_positions
+        return [Position(int(r), int(c)) for r, c in self.nonempties()]
     
+    def apply_move_inplace(self, move: Move) -> UndoRecord:
+        """
+        Move a ball in place and return the record needed to undo it.
+
+        Only the ball move itself and the bookkeeping snapshot happen
+        here; the caller records any match removals, spawned balls and
+        score change on the returned record before calling undo().
+        """
+        src = move.from_pos.row * self.cols + move.from_pos.col
+        dst = move.to_pos.row * self.cols + move.to_pos.col
+        flat_board = self.board.ravel()
+        color = int(flat_board[src])
+
+        record = UndoRecord(
+            src=src,
+            dst=dst,
+            color=color,
+            prev_next_balls=self.next_balls,
+            prev_move_count=self.move_count,
+            prev_game_over=self.game_over,
+        )
+        flat_board[dst] = color
+        flat_board[src] = int(BallColor.EMPTY)
+        self.move_count += 1
+        return record
+
+    def undo(self, record: UndoRecord) -> None:
+        """Reverse a move applied with apply_move_inplace."""
+        flat_board = self.board.ravel()
+        # Reverse order of application: restore the matched cells first
+        # (which may include the destination), then drop spawned balls,
+        # then move back. A ball auto-matched right after spawning is in
+        # both lists with its post-spawn color and must end EMPTY — the
+        # cell was empty before the spawn — so added is cleared last
+        for idx, color in record.removed:
+            flat_board[idx] = color
+        for idx in record.added:
+            flat_board[idx] = int(BallColor.EMPTY)
+        flat_board[record.src] = record.color
+        flat_board[record.dst] = int(BallColor.EMPTY)
+        self.score -= record.score_delta
+        self.next_balls = record.prev_next_balls
+        self.move_count = record.prev_move_count
+        self.game_over = record.prev_game_over
+
     def clone(self) -> 'GameState':
         """Create a deep copy of this game state."""
         return GameState(
@@ -146,46 +246,32 @@ class GameState:
             game_over=self.game_over
         )
     
+    # One-hot rows per BallColor value, indexed by the int8 cell value
+    _ONE_HOT = np.eye(len(BallColor), dtype=np.float32)
+
     def to_feature_vector(self) -> np.ndarray:
         """
         Convert game state to a feature vector for ML models.
-        
+
         Returns:
             Flattened representation of the board with one-hot encoding for colors.
         """
-        # One-hot encode the board
-        num_colors = len(BallColor)
-        features = np.zeros((self.rows, self.cols, num_colors), dtype=np.float32)
-        
-        for row in range(self.rows):
-            for col in range(self.cols):
-                color = self.board[row, col]
-                features[row, col, color] = 1.0
-        
-        return features
+        # One-hot encode the board with a single indexed gather
+        return self._ONE_HOT[self.board]
     
+    # Symbol per BallColor value, indexed by the int8 cell value
+    _COLOR_SYMBOLS = np.array(['.', 'R', 'G', 'B', 'N', 'M', 'Y', 'C'])
+
     def __repr__(self):
         """String representation of the game state."""
         lines = [f"GameState(score={self.score}, moves={self.move_count})"]
         lines.append(f"Next balls: {[c.name for c in self.next_balls]}")
-        
-        # Create a visual representation of the board
-        color_symbols = {
-            BallColor.EMPTY: '.',
-            BallColor.RED: 'R',
-            BallColor.GREEN: 'G',
-            BallColor.BLUE: 'B',
-            BallColor.BROWN: 'N',
-            BallColor.MAGENTA: 'M',
-            BallColor.YELLOW: 'Y',
-            BallColor.CYAN: 'C',
-        }
-        
-        for row in range(self.rows):
-            row_str = ' '.join(color_symbols[BallColor(self.board[row, col])] 
-                              for col in range(self.cols))
-            lines.append(row_str)
-        
+
+        # Create a visual representation of the board (one lookup per row
+        # instead of a BallColor round-trip per cell)
+        symbols = self._COLOR_SYMBOLS[self.board]
+        lines.extend(' '.join(row) for row in symbols)
+
         return '\n'.join(lines)
 
 
@@ -200,6 +286,11 @@ class GameConfig:
     initial_balls: int = 5  # Number of balls at game start
     show_next_balls: bool = True  # Whether to show preview of next balls (game mode)
 
+    def __post_init__(self):
+        """Cache the playable color palette for the configured color count."""
+        self._valid_colors = tuple(BallColor.get_valid_colors()[:self.colors_count])
+        self._valid_colors_arr = np.asarray(self._valid_colors, dtype=np.int8)
+
     def validate(self) -> bool:
         """Validate the configuration."""
         if self.rows <= 0 or self.cols <= 0:
@@ -225,6 +316,14 @@ class MoveResult:
         points_earned: Points earned from this move
         new_balls_added: Positions where new balls were added
         path: The path taken by the ball (for visualization)
+        balls_removed_idx: Flat indices (row * cols + col) of balls_removed
+        new_balls_added_idx: Flat indices of new_balls_added
+        path_idx: Flat indices of path
+
+    The *_idx arrays mirror the Position lists for consumers that work
+    in flat-index space (search/training loops); the simulation fills
+    them from its kernels at no extra cost, other producers may leave
+    them None.
     """
     success: bool
     new_state: Optional[GameState] = None
@@ -233,6 +332,9 @@ class MoveResult:
     new_balls_added: List[Tuple[Position, BallColor]] = field(default_factory=list)
     path: List[Position] = field(default_factory=list)
     error_message: str = ""
+    balls_removed_idx: Optional[np.ndarray] = None
+    new_balls_added_idx: Optional[np.ndarray] = None
+    path_idx: Optional[np.ndarray] = None
     
     @property
     def is_valid(self) -> bool:
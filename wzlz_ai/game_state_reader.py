@@ -10,11 +10,21 @@ This module provides high-level functions to extract all game state information:
 """
 
 from typing import Optional, Tuple, List
+from concurrent.futures import ThreadPoolExecutor
+import os
 import numpy as np
 import cv2
 
 from .game_state import GameState, BallColor, GameConfig
-from .window_capture import WindowCapture, GameWindowConfig, extract_cell_colors
+from .window_capture import (WindowCapture, GameWindowConfig,
+                             extract_cell_colors, aligned_uint8)
+from ._board_jit import classify_cells_nearest, NUMBA_AVAILABLE
+
+try:
+    import pytesseract
+    _HAS_TESSERACT = True
+except ImportError:
+    _HAS_TESSERACT = False
 
 
 # Ball color samples (RGB values)
@@ -50,9 +60,46 @@ class GameStateReader:
         self.config = GameWindowConfig(config_file)
         self.color_samples = color_samples or DEFAULT_BALL_COLOR_SAMPLES
         self.color_threshold = 80.0  # Maximum color distance for matching
-        
+        self._threshold_sq = self.color_threshold ** 2
+        self._rebuild_sample_table()
+
+        # OCR result for the last score image seen; the score region is
+        # identical between moves so most frames skip Tesseract entirely
+        self._last_score_hash: Optional[int] = None
+        self._last_score = 0
+
+        # Per-digit templates for the in-process matcher (loaded lazily
+        # from digit_template_dir; None until the first load attempt)
+        self.digit_template_dir = 'digit_templates'
+        self._digit_templates: Optional[List[np.ndarray]] = None
+
+        # One reusable capture buffer per region, sized on first use.
+        # Regions get their own buffer so the pooled extractions below
+        # never share one
+        self._buffers: dict = {}
+
+        # The per-region extractions are independent and spend their
+        # time in cv2/numba calls that release the GIL, so they run on
+        # worker threads (one per region of read_game_state)
+        self._pool = ThreadPoolExecutor(max_workers=4)
+
         # Try to find window on initialization
         self.window_capture.find_window()
+
+    def _rebuild_sample_table(self):
+        """
+        Pack the color samples into contiguous arrays for the parser.
+
+        The classifiers only ever read these two arrays; the dict is
+        just the calibration-facing view and stays off the hot path.
+        """
+        order = list(self.color_samples.keys())
+        self._sample_labels = np.ascontiguousarray(
+            [int(c) for c in order], dtype=np.int8)
+        self._sample_arr = np.ascontiguousarray(
+            [np.asarray(self.color_samples[c], dtype=np.float32).ravel()
+             for c in order], dtype=np.float32)
+        assert self._sample_arr.flags['C_CONTIGUOUS']
     
     def read_game_state(self, game_config: Optional[GameConfig] = None) -> Optional[GameState]:
         """
@@ -68,14 +115,27 @@ class GameStateReader:
         if not self.window_capture.hwnd:
             if not self.window_capture.find_window():
                 return None
-        
-        # Read all components
-        board = self.read_board()
+
+        # Capture the window once and slice every region from it
+        frame = self.window_capture.capture()
+        if frame is None:
+            return None
+
+        # Read all components concurrently: each extraction touches its
+        # own region buffer and releases the GIL inside cv2, so the
+        # three parses overlap instead of running back to back
+        board_future = self._pool.submit(self.read_board, frame)
+        score_future = self._pool.submit(self.read_current_score, frame)
+        balls_future = self._pool.submit(self.read_next_balls, frame)
+
+        board = board_future.result()
         if board is None:
+            score_future.result()
+            balls_future.result()
             return None
-        
-        current_score = self.read_current_score()
-        next_balls = self.read_next_balls()
+
+        current_score = score_future.result()
+        next_balls = balls_future.result()
         
         # Create game state
         if game_config is None:
@@ -90,75 +150,103 @@ class GameStateReader:
         
         return state
     
-    def read_board(self) -> Optional[np.ndarray]:
+    def read_board(self, frame: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
         """
         Read board state from the window.
         
+        Args:
+            frame: Already captured full frame to reuse (optional)
+
         Returns:
             9x9 numpy array of BallColor values, or None if failed
         """
         if not self.config.board_rect:
             return None
-        
-        # Capture board region
-        board_img = self.window_capture.capture_region(self.config.board_rect)
-        if board_img is None:
+
+        # Capture board region into its reusable buffer
+        board_img = self._region_buffer('board', self.config.board_rect)
+        if not self.window_capture.capture_region_into(
+                self.config.board_rect, board_img, frame):
             return None
-        
+
         # Parse board
         return self._parse_board(board_img)
+
+    def _region_buffer(self, name: str, rect) -> np.ndarray:
+        """Reusable capture buffer for a named region, (re)sized to rect."""
+        buf = self._buffers.get(name)
+        h, w = rect[3], rect[2]
+        if buf is None or buf.shape[0] != h or buf.shape[1] != w:
+            # Aligned like the DIB frame buffer, so the cv2 calls that
+            # consume these regions get aligned SIMD loads
+            buf = self._buffers[name] = aligned_uint8((h, w, 3))
+        return buf
     
-    def read_current_score(self) -> int:
+    def read_current_score(self, frame: Optional[np.ndarray] = None) -> int:
         """
         Read current score from the window.
         
+        Args:
+            frame: Already captured full frame to reuse (optional)
+
         Returns:
             Current score value (0 if failed)
         """
         if not self.config.current_score_rect:
             return 0
         
-        # Capture score region
-        score_img = self.window_capture.capture_region(self.config.current_score_rect)
-        if score_img is None:
+        # Capture score region into its reusable buffer
+        score_img = self._region_buffer(
+            'current_score', self.config.current_score_rect)
+        if not self.window_capture.capture_region_into(
+                self.config.current_score_rect, score_img, frame):
             return 0
-        
+
         # Read score using OCR
         return self._read_score_ocr(score_img)
     
-    def read_high_score(self) -> int:
+    def read_high_score(self, frame: Optional[np.ndarray] = None) -> int:
         """
         Read high score from the window.
         
+        Args:
+            frame: Already captured full frame to reuse (optional)
+
         Returns:
             High score value (0 if failed)
         """
         if not self.config.high_score_rect:
             return 0
         
-        # Capture score region
-        score_img = self.window_capture.capture_region(self.config.high_score_rect)
-        if score_img is None:
+        # Capture score region into its reusable buffer
+        score_img = self._region_buffer('high_score', self.config.high_score_rect)
+        if not self.window_capture.capture_region_into(
+                self.config.high_score_rect, score_img, frame):
             return 0
-        
+
         # Read score using OCR
         return self._read_score_ocr(score_img)
     
-    def read_next_balls(self) -> Optional[List[BallColor]]:
+    def read_next_balls(self, frame: Optional[np.ndarray] = None) -> Optional[List[BallColor]]:
         """
         Read next balls preview from the window.
         
+        Args:
+            frame: Already captured full frame to reuse (optional)
+
         Returns:
             List of 3 ball colors, or None if failed
         """
         if not self.config.next_balls_rect:
             return None
         
-        # Capture next balls region
-        next_balls_img = self.window_capture.capture_region(self.config.next_balls_rect)
-        if next_balls_img is None:
+        # Capture next balls region into its reusable buffer
+        next_balls_img = self._region_buffer(
+            'next_balls', self.config.next_balls_rect)
+        if not self.window_capture.capture_region_into(
+                self.config.next_balls_rect, next_balls_img, frame):
             return None
-        
+
         # Detect next balls
         return self._detect_next_balls(next_balls_img)
     
@@ -174,16 +262,25 @@ class GameStateReader:
         """
         # Extract average colors from each cell
         cell_colors = extract_cell_colors(board_img, rows=9, cols=9)
-        
-        # Detect ball color for each cell
-        board = np.zeros((9, 9), dtype=np.int8)
-        
-        for row in range(9):
-            for col in range(9):
-                avg_color = cell_colors[row, col]
-                ball_color = self._detect_ball_color(avg_color)
-                board[row, col] = ball_color
-        
+
+        if NUMBA_AVAILABLE:
+            # Compiled nearest-sample loop: no intermediate tensors at all
+            return classify_cells_nearest(
+                cell_colors.astype(np.float32), self._sample_arr,
+                self._sample_labels, np.float32(self._threshold_sq))
+
+        # Classify all 81 cells against all samples in one broadcast:
+        # squared distances, nearest sample per cell, then the distance
+        # threshold (squared, since sqrt is monotonic)
+        diff = cell_colors.astype(np.float32)[:, :, None, :] - \
+            self._sample_arr[None, None, :, :]
+        d2 = np.einsum('rcsk,rcsk->rcs', diff, diff)
+        nearest = d2.argmin(axis=2)
+        board = self._sample_labels[nearest]
+        too_far = np.take_along_axis(
+            d2, nearest[:, :, None], axis=2)[:, :, 0] > self._threshold_sq
+        board[too_far] = int(BallColor.EMPTY)
+
         return board
     
     def _detect_ball_color(self, avg_color: np.ndarray) -> BallColor:
@@ -198,17 +295,20 @@ class GameStateReader:
         """
         best_match = BallColor.EMPTY
         min_distance = float('inf')
-        
+
+        # Squared L2 keeps the argmin (sqrt is monotonic) and skips the
+        # per-sample sqrt
         for ball_color, sample_color in self.color_samples.items():
-            distance = np.linalg.norm(avg_color - sample_color)
+            diff = avg_color - sample_color
+            distance = float(np.dot(diff, diff))
             if distance < min_distance:
                 min_distance = distance
                 best_match = ball_color
-        
+
         # If distance is too large, consider it empty
-        if min_distance > self.color_threshold:
+        if min_distance > self._threshold_sq:
             return BallColor.EMPTY
-        
+
         return best_match
     
     def _read_score_ocr(self, score_img: np.ndarray) -> int:
@@ -221,23 +321,131 @@ class GameStateReader:
         Returns:
             Score value (0 if failed to read)
         """
+        # The score only changes after a match; reuse the previous OCR
+        # result when the pixels are identical
+        img_hash = hash(score_img.tobytes())
+        if img_hash == self._last_score_hash:
+            return self._last_score
+
         try:
-            import pytesseract
-            
-            # Preprocess for OCR
+            # Preprocess: upscale so the digits have enough strokes,
+            # and let Otsu pick the threshold so brightness shifts
+            # don't break binarization
             gray = cv2.cvtColor(score_img, cv2.COLOR_RGB2GRAY)
-            _, binary = cv2.threshold(gray, 127, 255, cv2.THRESH_BINARY)
-            
-            # OCR (digits only)
-            text = pytesseract.image_to_string(binary, config='--psm 7 digits')
-            
-            # Extract number
-            digits = ''.join(filter(str.isdigit, text))
-            if digits:
-                return int(digits)
-            return 0
-        except:
-            return 0
+            gray = cv2.resize(gray, None, fx=2, fy=2,
+                              interpolation=cv2.INTER_CUBIC)
+            _, binary = cv2.threshold(
+                gray, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+
+            # The score font is fixed, so ten template matches beat a
+            # Tesseract subprocess; fall back to Tesseract only when
+            # templates are missing or match confidence is low
+            score = self._match_score_digits(binary)
+            if score is None and _HAS_TESSERACT:
+                text = pytesseract.image_to_string(
+                    binary,
+                    config='--oem 1 --psm 8 '
+                           '-c tessedit_char_whitelist=0123456789')
+                digits = ''.join(filter(str.isdigit, text))
+                score = int(digits) if digits else 0
+            elif score is None:
+                score = 0
+        except Exception:
+            score = 0
+
+        self._last_score_hash = img_hash
+        self._last_score = score
+        return score
+
+    def _load_digit_templates(self) -> List[np.ndarray]:
+        """
+        Load the 0-9 digit templates for the in-process score matcher.
+
+        Templates are binarized grayscale images read once from
+        ``<digit_template_dir>/<digit>.png``; an empty list (no files,
+        or an incomplete set) means the matcher is unavailable and the
+        OCR path keeps using Tesseract.
+        """
+        if self._digit_templates is not None:
+            return self._digit_templates
+
+        templates = []
+        for digit in range(10):
+            path = os.path.join(self.digit_template_dir, f'{digit}.png')
+            img = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+            if img is None:
+                templates = []
+                break
+            _, binary = cv2.threshold(
+                img, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+            # Crop to the glyph so margins in the template files don't
+            # dilute the correlation against tight-cropped digit cells
+            ys, xs = np.nonzero(binary)
+            if ys.size == 0:
+                templates = []
+                break
+            templates.append(
+                binary[ys.min():ys.max() + 1, xs.min():xs.max() + 1])
+
+        if templates:
+            # One canonical size for templates and digit cells alike
+            shape = templates[0].shape
+            templates = [
+                cv2.resize(t, (shape[1], shape[0]),
+                           interpolation=cv2.INTER_AREA)
+                for t in templates]
+
+        self._digit_templates = templates
+        return templates
+
+    def _match_score_digits(self, binary: np.ndarray) -> Optional[int]:
+        """
+        Read the score from a binarized image by template matching.
+
+        Splits the image into digit runs on empty columns, resizes each
+        run to the template size and correlates it against all ten
+        digit templates. Returns None when templates are unavailable or
+        any digit matches below confidence 0.6, so the caller can fall
+        back to Tesseract.
+
+        Args:
+            binary: Binarized (0/255) score region image
+
+        Returns:
+            Score value, or None if matching is not trustworthy
+        """
+        templates = self._load_digit_templates()
+        if not templates:
+            return None
+
+        # Digits must be the foreground; invert white-background images
+        if np.count_nonzero(binary) > binary.size // 2:
+            binary = 255 - binary
+
+        # Column projection: digit cells are runs of non-empty columns
+        filled = binary.max(axis=0) > 0
+        if not filled.any():
+            return None
+        padded = np.concatenate(([False], filled, [False])).astype(np.int8)
+        starts = np.flatnonzero(np.diff(padded) == 1)
+        ends = np.flatnonzero(np.diff(padded) == -1)
+
+        template_h, template_w = templates[0].shape
+        digits = []
+        for x0, x1 in zip(starts, ends):
+            cell = binary[:, x0:x1]
+            rows = np.flatnonzero(cell.max(axis=1) > 0)
+            cell = cell[rows[0]:rows[-1] + 1]
+            cell = cv2.resize(cell, (template_w, template_h),
+                              interpolation=cv2.INTER_AREA)
+            scores = [cv2.matchTemplate(cell, t, cv2.TM_CCOEFF_NORMED)[0, 0]
+                      for t in templates]
+            best = int(np.argmax(scores))
+            if scores[best] < 0.6:
+                return None
+            digits.append(str(best))
+
+        return int(''.join(digits)) if digits else None
     
     def _detect_next_balls(self, next_balls_img: np.ndarray) -> List[BallColor]:
         """
@@ -249,25 +457,25 @@ class GameStateReader:
         Returns:
             List of detected ball colors (3 balls)
         """
-        # Divide into 3 regions (3 balls)
+        # Divide into 3 regions (3 balls) and average each in one
+        # reshaped reduction instead of a Python loop
         h, w = next_balls_img.shape[:2]
         ball_width = w // 3
-        
-        next_balls = []
-        
-        for i in range(3):
-            x1 = i * ball_width
-            x2 = (i + 1) * ball_width
-            ball_region = next_balls_img[:, x1:x2]
-            
-            # Get average color
-            avg_color = np.mean(ball_region, axis=(0, 1))
-            
-            # Detect color (use higher threshold for next balls)
-            ball_color = self._detect_ball_color(avg_color)
-            next_balls.append(ball_color)
-        
-        return next_balls
+        strip = next_balls_img[:, :ball_width * 3]
+        avg_colors = strip.reshape(h, 3, ball_width, 3).mean(axis=(0, 2))
+
+        # Classify all three against all samples with one broadcast,
+        # same squared-distance scheme as _parse_board
+        diff = avg_colors.astype(np.float32)[:, None, :] - \
+            self._sample_arr[None, :, :]
+        d2 = np.einsum('bsk,bsk->bs', diff, diff)
+        nearest = d2.argmin(axis=1)
+        labels = self._sample_labels[nearest]
+        labels[np.take_along_axis(
+            d2, nearest[:, None], axis=1)[:, 0] > self._threshold_sq] = \
+            int(BallColor.EMPTY)
+
+        return [BallColor(int(v)) for v in labels]
     
     def calibrate_colors(self, board_img: np.ndarray, known_positions: dict) -> dict:
         """
@@ -293,8 +501,15 @@ class GameStateReader:
     def set_color_samples(self, color_samples: dict):
         """Update ball color samples."""
         self.color_samples = color_samples
+        self._rebuild_sample_table()
     
     def set_color_threshold(self, threshold: float):
         """Update color matching threshold."""
         self.color_threshold = threshold
+        self._threshold_sq = float(threshold) ** 2
+
+    def close(self):
+        """Release the worker pool and capture resources."""
+        self._pool.shutdown(wait=False)
+        self.window_capture.close()
 
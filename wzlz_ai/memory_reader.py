@@ -6,6 +6,7 @@ which is more reliable than screen capture and doesn't depend on resolution.
 """
 
 from typing import Optional, List, Tuple, Dict
+from concurrent.futures import ThreadPoolExecutor
 import struct
 import numpy as np
 
@@ -19,6 +20,79 @@ except ImportError:
 from .game_state import BallColor, GameState, GameConfig
 
 
+# Precompiled converters per value type: parsing a format string on
+# every pack/unpack call is measurable in the tight scan/filter loops
+_STRUCTS = {
+    'int8': struct.Struct('<b'),
+    'int16': struct.Struct('<h'),
+    'int32': struct.Struct('<i'),
+    'int64': struct.Struct('<q'),
+    'float': struct.Struct('<f'),
+    'double': struct.Struct('<d'),
+}
+_SIZES = {k: s.size for k, s in _STRUCTS.items()}
+_NP_DTYPES = {
+    'int8': np.int8,
+    'int16': np.int16,
+    'int32': np.int32,
+    'int64': np.int64,
+    'float': np.float32,
+    'double': np.float64,
+}
+
+# System DLLs never hold the game's mutable state; skipping them keeps
+# the scan to the game module and its own libraries
+_SYSTEM_MODULES = frozenset({
+    'ntdll.dll', 'kernel32.dll', 'kernelbase.dll', 'user32.dll',
+    'gdi32.dll', 'gdi32full.dll', 'advapi32.dll', 'msvcrt.dll',
+    'msvcp_win.dll', 'ucrtbase.dll', 'combase.dll', 'ole32.dll',
+    'oleaut32.dll', 'shell32.dll', 'shlwapi.dll', 'win32u.dll',
+    'imm32.dll', 'rpcrt4.dll', 'sechost.dll', 'msctf.dll',
+    'bcryptprimitives.dll',
+})
+
+_IMAGE_SCN_MEM_WRITE = 0x80000000
+
+
+def _writable_sections(header: bytes, module_size: int) -> List[Tuple[int, int]]:
+    """
+    Parse PE section headers and return (offset, size) pairs of the
+    writable sections (.data, .bss and friends).
+
+    Code, resource and reloc sections are read-only at runtime and
+    cannot contain the board or score, so scans can skip them. If the
+    headers cannot be parsed the whole module is returned as one span
+    so the scan degrades to the old behavior rather than missing hits.
+    """
+    try:
+        if header[:2] != b'MZ':
+            raise ValueError('no DOS header')
+        e_lfanew = struct.unpack_from('<I', header, 0x3C)[0]
+        if header[e_lfanew:e_lfanew + 4] != b'PE\x00\x00':
+            raise ValueError('no NT header')
+        num_sections = struct.unpack_from('<H', header, e_lfanew + 6)[0]
+        opt_header_size = struct.unpack_from('<H', header, e_lfanew + 20)[0]
+        section_table = e_lfanew + 24 + opt_header_size
+
+        sections = []
+        for i in range(num_sections):
+            entry = section_table + 40 * i
+            if entry + 40 > len(header):
+                raise ValueError('section table truncated')
+            virtual_size, virtual_addr = struct.unpack_from('<II', header, entry + 8)
+            characteristics = struct.unpack_from('<I', header, entry + 36)[0]
+            if not characteristics & _IMAGE_SCN_MEM_WRITE:
+                continue
+            if virtual_addr >= module_size:
+                continue
+            size = min(virtual_size or module_size, module_size - virtual_addr)
+            if size > 0:
+                sections.append((virtual_addr, size))
+        return sections
+    except Exception:
+        return [(0, module_size)]
+
+
 class MemoryPattern:
     """Represents a memory pattern to search for."""
     
@@ -106,43 +180,65 @@ class MemoryScanner:
             return []
         
         addresses = []
-        
+
         # Convert value to bytes based on type
-        type_map = {
-            'int8': ('b', 1),
-            'int16': ('h', 2),
-            'int32': ('i', 4),
-            'int64': ('q', 8),
-            'float': ('f', 4),
-            'double': ('d', 8),
-        }
-        
-        if value_type not in type_map:
+        if value_type not in _STRUCTS:
             return []
-        
-        fmt, size = type_map[value_type]
-        search_bytes = struct.pack(fmt, value)
-        
-        # Scan readable memory regions
-        for module in self.pm.list_modules():
-            try:
-                module_base = module.lpBaseOfDll
-                module_size = module.SizeOfImage
-                
-                # Read module memory
-                memory = self.pm.read_bytes(module_base, module_size)
-                
-                # Search for pattern
-                offset = 0
-                while offset < len(memory) - size:
-                    if memory[offset:offset + size] == search_bytes:
-                        addresses.append(module_base + offset)
-                    offset += 1
-                    
-            except Exception:
-                continue
-        
+
+        size = _SIZES[value_type]
+        search_bytes = _STRUCTS[value_type].pack(value)
+
+        # Compare whole lanes at once: view the packed pattern and the
+        # module bytes as fixed-width unsigned integers, so the scan is
+        # one vectorized equality pass per byte offset (exact byte
+        # match, no float semantics involved)
+        lane_dtype = {1: np.uint8, 2: np.uint16, 4: np.uint32, 8: np.uint64}[size]
+        target = np.frombuffer(search_bytes, dtype=lane_dtype)[0]
+
+        # Scan only the writable sections of non-system modules; modules
+        # are independent and both read_bytes and the numpy compares
+        # release the GIL, so scan them from a thread pool
+        modules = list(self.pm.list_modules())
+        if not modules:
+            return addresses
+        with ThreadPoolExecutor(max_workers=min(8, len(modules))) as pool:
+            for module_hits in pool.map(
+                    lambda m: self._scan_module_for_value(
+                        m, target, lane_dtype, size),
+                    modules):
+                addresses.extend(module_hits)
+
         return addresses
+
+    def _scan_module_for_value(self, module, target, lane_dtype,
+                               size: int) -> List[int]:
+        """Lane-scan one module's writable sections for a packed value."""
+        try:
+            if getattr(module, 'name', '').lower() in _SYSTEM_MODULES:
+                return []
+            module_base = module.lpBaseOfDll
+            module_size = module.SizeOfImage
+
+            header = self.pm.read_bytes(module_base, min(4096, module_size))
+
+            module_hits = []
+            for sec_offset, sec_size in _writable_sections(header, module_size):
+                memory = self.pm.read_bytes(module_base + sec_offset, sec_size)
+                buf = np.frombuffer(memory, dtype=np.uint8)
+
+                for shift in range(size):
+                    span = (buf.size - shift) // size * size
+                    if span <= 0:
+                        continue
+                    lane = buf[shift:shift + span].view(lane_dtype)
+                    hits = np.flatnonzero(lane == target)
+                    if hits.size:
+                        module_hits.extend(
+                            (module_base + sec_offset + shift + hits * size).tolist())
+            return sorted(module_hits)
+
+        except Exception:
+            return []
     
     def filter_addresses(self, addresses: List[int], value: int, value_type: str = 'int32') -> List[int]:
         """
@@ -159,29 +255,109 @@ class MemoryScanner:
         if not self.pm:
             return []
         
-        type_map = {
-            'int8': ('b', 1),
-            'int16': ('h', 2),
-            'int32': ('i', 4),
-            'int64': ('q', 8),
-            'float': ('f', 4),
-            'double': ('d', 8),
-        }
-        
-        fmt, size = type_map.get(value_type, ('i', 4))
+        st = _STRUCTS.get(value_type, _STRUCTS['int32'])
+        size = st.size
         filtered = []
-        
-        for addr in addresses:
+
+        if not addresses:
+            return filtered
+
+        # Coalesce nearby candidates into one read each: a scan can
+        # return thousands of addresses and the per-address syscall is
+        # what dominates, not the comparison
+        addrs = np.sort(np.asarray(addresses, dtype=np.int64))
+        splits = np.flatnonzero(np.diff(addrs) > 4096) + 1
+        for run in np.split(addrs, splits):
+            lo = int(run[0])
+            span = int(run[-1]) - lo + size
             try:
-                data = self.pm.read_bytes(addr, size)
-                current_value = struct.unpack(fmt, data)[0]
-                if current_value == value:
-                    filtered.append(addr)
+                buf = self.pm.read_bytes(lo, span)
             except Exception:
+                # Part of the run is unreadable; fall back to testing
+                # each candidate on its own
+                for addr in run:
+                    try:
+                        data = self.pm.read_bytes(int(addr), size)
+                        if st.unpack(data)[0] == value:
+                            filtered.append(int(addr))
+                    except Exception:
+                        continue
                 continue
-        
+
+            for addr in run:
+                if st.unpack_from(buf, int(addr) - lo)[0] == value:
+                    filtered.append(int(addr))
+
         return filtered
     
+    def read_many(self, specs: List[Tuple]) -> List:
+        """
+        Read several typed values with coalesced process reads.
+
+        Sorts the requests by address, groups neighbors (gap up to 256
+        bytes) into runs, reads each run with one read_bytes call and
+        demuxes the values from the buffer. Polling board + score +
+        next balls this way costs one or two process reads per frame
+        instead of one per value.
+
+        Args:
+            specs: (address, value_type) tuples, or (address,
+                value_type, count) for arrays of count elements
+
+        Returns:
+            One entry per spec in the same order: a scalar for
+            two-element specs, an ndarray for three-element ones, or
+            None where the type is unknown or the read failed
+        """
+        results: List = [None] * len(specs)
+        if not self.pm or not specs:
+            return results
+
+        spans = []  # (start, end, spec index) for readable specs
+        for i, spec in enumerate(specs):
+            address, value_type = spec[0], spec[1]
+            count = spec[2] if len(spec) > 2 else None
+            if value_type not in _SIZES:
+                continue
+            size = _SIZES[value_type] * (count if count is not None else 1)
+            spans.append((address, address + size, i))
+        spans.sort()
+
+        runs: List[List[Tuple[int, int, int]]] = []
+        run_end = 0
+        for span in spans:
+            if runs and span[0] - run_end <= 256:
+                runs[-1].append(span)
+                run_end = max(run_end, span[1])
+            else:
+                runs.append([span])
+                run_end = span[1]
+
+        for run in runs:
+            lo = run[0][0]
+            hi = max(end for _, end, _ in run)
+            try:
+                buf = self.pm.read_bytes(lo, hi - lo)
+            except Exception:
+                buf = None
+            for start, end, i in run:
+                if buf is None:
+                    # Unreadable run: try each value on its own
+                    try:
+                        data = self.pm.read_bytes(start, end - start)
+                    except Exception:
+                        continue
+                else:
+                    data = buf[start - lo:end - lo]
+                value_type = specs[i][1]
+                if len(specs[i]) > 2:
+                    results[i] = np.frombuffer(
+                        data, dtype=_NP_DTYPES[value_type]).copy()
+                else:
+                    results[i] = _STRUCTS[value_type].unpack(data)[0]
+
+        return results
+
     def read_value(self, address: int, value_type: str = 'int32') -> Optional[int]:
         """
         Read a value from memory.
@@ -233,7 +409,7 @@ class MemoryScanner:
         except Exception:
             return None
     
-    def read_array(self, address: int, count: int, value_type: str = 'int8') -> Optional[List[int]]:
+    def read_array(self, address: int, count: int, value_type: str = 'int8') -> Optional[np.ndarray]:
         """
         Read an array of values from memory.
         
@@ -243,23 +419,19 @@ class MemoryScanner:
             value_type: Type of each element
             
         Returns:
-            List of values, or None if failed
-        """
-        type_map = {
-            'int8': ('b', 1),
-            'int16': ('h', 2),
-            'int32': ('i', 4),
-            'int64': ('q', 8),
-        }
-        
-        fmt, size = type_map.get(value_type, ('b', 1))
-        
+            Array of values (copy, safe to mutate), or None if failed
+        """
+        dtype = _NP_DTYPES.get(value_type, np.int8)
+        size = np.dtype(dtype).itemsize
+
         data = self.read_bytes(address, count * size)
         if data is None:
             return None
-        
+
         try:
-            return list(struct.unpack(f'{count}{fmt}', data))
+            # frombuffer gives a read-only view of the bytes; copy so
+            # callers get an ordinary writable array
+            return np.frombuffer(data, dtype=dtype, count=count).copy()
         except Exception:
             return None
 
@@ -297,31 +469,52 @@ class GameMemoryReader:
             # Search for the board pattern
             # The board is likely stored as 81 consecutive bytes (9x9 grid)
             candidates = []
-            
-            # Try to find sequences that match the board
-            for module in self.scanner.pm.list_modules():
-                try:
-                    module_base = module.lpBaseOfDll
-                    module_size = module.SizeOfImage
-                    memory = self.scanner.pm.read_bytes(module_base, module_size)
-                    
-                    # Convert board to bytes
-                    board_bytes = known_board.flatten().astype(np.int8).tobytes()
-                    
-                    # Search for exact match
-                    offset = 0
-                    while offset < len(memory) - 81:
-                        if memory[offset:offset + 81] == board_bytes:
-                            candidates.append(module_base + offset)
-                        offset += 1
-                        
-                except Exception:
-                    continue
-            
+
+            # Convert board to bytes once
+            board_bytes = known_board.flatten().astype(np.int8).tobytes()
+
+            # Try to find sequences that match the board, looking only
+            # at writable sections of non-system modules; one pool
+            # thread per module, same as the value scan
+            modules = list(self.scanner.pm.list_modules())
+            if not modules:
+                return candidates
+            with ThreadPoolExecutor(max_workers=min(8, len(modules))) as pool:
+                for module_hits in pool.map(
+                        lambda m: self._find_pattern_in_module(m, board_bytes),
+                        modules):
+                    candidates.extend(module_hits)
+
             return candidates
         
         return []
-    
+
+    def _find_pattern_in_module(self, module, pattern: bytes) -> List[int]:
+        """Find all occurrences of a byte pattern in one module."""
+        try:
+            if getattr(module, 'name', '').lower() in _SYSTEM_MODULES:
+                return []
+            module_base = module.lpBaseOfDll
+            module_size = module.SizeOfImage
+
+            header = self.scanner.pm.read_bytes(
+                module_base, min(4096, module_size))
+
+            module_hits = []
+            for sec_offset, sec_size in _writable_sections(header, module_size):
+                memory = self.scanner.pm.read_bytes(
+                    module_base + sec_offset, sec_size)
+
+                # Search for exact match with C-level find
+                offset = memory.find(pattern)
+                while offset != -1:
+                    module_hits.append(module_base + sec_offset + offset)
+                    offset = memory.find(pattern, offset + 1)
+            return module_hits
+
+        except Exception:
+            return []
+
     def find_score_address(self, known_score: int) -> List[int]:
         """
         Find potential addresses for the score.
@@ -344,11 +537,12 @@ class GameMemoryReader:
         Returns:
             9x9 numpy array of ball colors, or None if failed
         """
-        data = self.scanner.read_array(address, 81, 'int8')
-        if data is None:
+        data = self.scanner.read_bytes(address, 81)
+        if data is None or len(data) < 81:
             return None
-        
-        return np.array(data, dtype=np.int8).reshape(9, 9)
+
+        # Single 81-byte memcpy instead of a Python-list round-trip
+        return np.frombuffer(data, dtype=np.int8, count=81).reshape(9, 9).copy()
     
     def read_score(self, address: int) -> Optional[int]:
         """
@@ -382,21 +576,26 @@ class GameMemoryReader:
         
         if board_address is None:
             return None
-        
-        board = self.read_board(board_address)
-        if board is None:
+
+        # One batched read for the whole poll (board and score coalesce
+        # into a single process read when their addresses are close)
+        specs = [(board_address, 'int8', 81)]
+        if score_address is not None:
+            specs.append((score_address, 'int32'))
+        values = self.scanner.read_many(specs)
+
+        board_flat = values[0]
+        if board_flat is None:
             return None
-        
+        board = board_flat.reshape(9, 9)
+
         score = 0
-        if score_address is not None:
-            score_val = self.read_score(score_address)
-            if score_val is not None:
-                score = score_val
+        if score_address is not None and values[1] is not None:
+            score = values[1]
         
         return GameState(
             board=board,
             score=score,
-            next_balls=[],
-            config=GameConfig()
+            next_balls=[]
         )
 
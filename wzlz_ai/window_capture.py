@@ -5,6 +5,7 @@ This module provides efficient window capture using Win32 APIs.
 """
 
 from typing import Tuple, Optional
+import ctypes
 import json
 from pathlib import Path
 import numpy as np
@@ -20,6 +21,86 @@ except ImportError:
     print("Install with: pip install pywin32 pillow opencv-python")
     raise
 
+# orjson parses and serializes several times faster than stdlib json;
+# worth having during calibration, where the config is rewritten often
+try:
+    import orjson
+
+    def _json_loads(data: bytes):
+        return orjson.loads(data)
+
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    def _json_loads(data: bytes):
+        return json.loads(data)
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+# DXGI Desktop Duplication delivers frames GPU-side at monitor refresh
+# rate, where BitBlt is a synchronous GDI copy that dominates full-window
+# capture time; dxcam wraps the duplication interface and is optional
+try:
+    import dxcam
+    _HAS_DXCAM = True
+except ImportError:
+    _HAS_DXCAM = False
+
+
+class _BITMAPINFOHEADER(ctypes.Structure):
+    _fields_ = [
+        ('biSize', ctypes.c_uint32),
+        ('biWidth', ctypes.c_int32),
+        ('biHeight', ctypes.c_int32),
+        ('biPlanes', ctypes.c_uint16),
+        ('biBitCount', ctypes.c_uint16),
+        ('biCompression', ctypes.c_uint32),
+        ('biSizeImage', ctypes.c_uint32),
+        ('biXPelsPerMeter', ctypes.c_int32),
+        ('biYPelsPerMeter', ctypes.c_int32),
+        ('biClrUsed', ctypes.c_uint32),
+        ('biClrImportant', ctypes.c_uint32),
+    ]
+
+
+def aligned_uint8(shape, align: int = 32) -> np.ndarray:
+    """
+    Allocate a uint8 array whose data starts on an align-byte boundary.
+
+    cvtColor/resize over a 32-byte-aligned source use aligned AVX2
+    loads; np.empty only guarantees 16. The DIB section backing
+    capture() is page-aligned already, so this brings the persistent
+    region staging buffers in line with it. The over-allocated base
+    array stays alive through the returned view.
+
+    Args:
+        shape: Shape of the returned array
+        align: Required data pointer alignment in bytes
+
+    Returns:
+        Writable uint8 array of the given shape, aligned as requested
+    """
+    size = int(np.prod(shape))
+    raw = np.empty(size + align, dtype=np.uint8)
+    offset = (-raw.ctypes.data) % align
+    return raw[offset:offset + size].reshape(shape)
+
+
+def _title_match_callback(hwnd, ctx):
+    """EnumWindows callback: find the first visible window whose title contains ctx[0]."""
+    if not win32gui.IsWindowVisible(hwnd):
+        return True
+    text = win32gui.GetWindowText(hwnd)
+    title, windows = ctx
+    # Most top-level windows are untitled; skip them before substring
+    # matching, and stop enumerating as soon as a match is found
+    if text and title in text:
+        windows.append(hwnd)
+        return False
+    return True
+
 
 class WindowCapture:
     """Captures screenshots from a specific window using Win32 APIs."""
@@ -34,29 +115,58 @@ class WindowCapture:
         self.window_title = window_title
         self.hwnd: Optional[int] = None
         self.window_rect: Optional[Tuple[int, int, int, int]] = None
+
+        # Cached GDI objects, recreated only when the window or its
+        # size changes (keyed by (hwnd, width, height)). The bitmap is
+        # a DIB section whose pixels BitBlt writes straight into
+        # _frame_buffer, so a capture involves no GetBitmapBits copy
+        self._hwndDC = None
+        self._mfcDC = None
+        self._saveDC = None
+        self._hbitmap = None
+        self._frame_buffer: Optional[np.ndarray] = None
+        self._dc_key: Optional[Tuple[int, int, int]] = None
+
+        # Cached board-grid detection, reused while the subsampled
+        # frame fingerprint stays put (the board rect almost never
+        # moves mid-game)
+        self._last_grid: Optional[Tuple[int, int, int, int]] = None
+        self._last_fingerprint: Optional[np.ndarray] = None
         
     def find_window(self) -> bool:
         """
         Find the game window by title.
-        
+
         Returns:
             True if window found
         """
-        def callback(hwnd, windows):
-            if win32gui.IsWindowVisible(hwnd):
-                title = win32gui.GetWindowText(hwnd)
-                if self.window_title in title:
-                    windows.append(hwnd)
+        # Exact-title lookup first: FindWindow walks the window list in
+        # one C call, versus a Python callback per top-level window
+        try:
+            hwnd = win32gui.FindWindow(None, self.window_title)
+        except Exception:
+            hwnd = 0
+        if hwnd and win32gui.IsWindowVisible(hwnd):
+            self.hwnd = hwnd
+            self.window_rect = win32gui.GetWindowRect(hwnd)
             return True
-        
-        windows = []
-        win32gui.EnumWindows(callback, windows)
-        
+
+        # Fall back to the substring scan for decorated titles. The
+        # callback aborts enumeration on first match by returning
+        # False, which pywin32 surfaces as an exception
+        windows: list = []
+        try:
+            win32gui.EnumWindows(_title_match_callback,
+                                 (self.window_title, windows))
+        except Exception:
+            if not windows:
+                raise
+
         if windows:
             self.hwnd = windows[0]
             self.window_rect = win32gui.GetWindowRect(self.hwnd)
             return True
-        
+
         return False
     
     def capture(self) -> Optional[np.ndarray]:
@@ -75,58 +185,258 @@ class WindowCapture:
             left, top, right, bottom = win32gui.GetWindowRect(self.hwnd)
             width = right - left
             height = bottom - top
-            
-            # Get window DC
-            hwndDC = win32gui.GetWindowDC(self.hwnd)
-            mfcDC = win32ui.CreateDCFromHandle(hwndDC)
-            saveDC = mfcDC.CreateCompatibleDC()
-            
-            # Create bitmap
-            saveBitMap = win32ui.CreateBitmap()
-            saveBitMap.CreateCompatibleBitmap(mfcDC, width, height)
-            saveDC.SelectObject(saveBitMap)
-            
-            # Capture
-            saveDC.BitBlt((0, 0), (width, height), mfcDC, (0, 0), win32con.SRCCOPY)
-
-            # Convert to numpy array (BGR format to match unified_capture.py)
-            bmpinfo = saveBitMap.GetInfo()
-            bmpstr = saveBitMap.GetBitmapBits(True)
-
-            img = np.frombuffer(bmpstr, dtype=np.uint8)
-            img.shape = (height, width, 4)
-
-            # Convert BGRA to BGR (drop alpha channel)
-            img = img[:, :, :3]
-
-            # Cleanup
-            win32gui.DeleteObject(saveBitMap.GetHandle())
-            saveDC.DeleteDC()
-            mfcDC.DeleteDC()
-            win32gui.ReleaseDC(self.hwnd, hwndDC)
-
-            return img
-            
+
+            # Reuse the DCs and bitmap across frames; creating and
+            # deleting five GDI objects per capture dominates the cost
+            # of small windows
+            if (self.hwnd, width, height) != self._dc_key:
+                self._release_gdi()
+                self._hwndDC = win32gui.GetWindowDC(self.hwnd)
+                self._mfcDC = win32ui.CreateDCFromHandle(self._hwndDC)
+                self._saveDC = self._mfcDC.CreateCompatibleDC()
+
+                # DIB section: Windows renders into memory we can wrap
+                # as an ndarray, so there is no per-frame pixel copy.
+                # 24-bit BGR skips the alpha channel entirely — 25%
+                # less blit bandwidth and no BGRA conversion. Negative
+                # height selects top-down row order; DIB rows are
+                # padded to 4-byte multiples
+                bmi = _BITMAPINFOHEADER()
+                bmi.biSize = ctypes.sizeof(_BITMAPINFOHEADER)
+                bmi.biWidth = width
+                bmi.biHeight = -height
+                bmi.biPlanes = 1
+                bmi.biBitCount = 24
+                bmi.biCompression = 0  # BI_RGB
+                bits = ctypes.c_void_p()
+                self._hbitmap = ctypes.windll.gdi32.CreateDIBSection(
+                    self._mfcDC.GetSafeHdc(), ctypes.byref(bmi), 0,
+                    ctypes.byref(bits), None, 0)
+                if not self._hbitmap or not bits.value:
+                    raise RuntimeError("CreateDIBSection failed")
+                win32gui.SelectObject(self._saveDC.GetSafeHdc(), self._hbitmap)
+
+                stride = (width * 3 + 3) & ~3
+                raw = (ctypes.c_uint8 * (stride * height)).from_address(bits.value)
+                self._frame_buffer = np.ndarray(
+                    (height, width, 3), dtype=np.uint8, buffer=raw,
+                    strides=(stride, 3, 1))
+                self._dc_key = (self.hwnd, width, height)
+
+            # Capture: BitBlt writes straight into _frame_buffer
+            self._saveDC.BitBlt((0, 0), (width, height), self._mfcDC,
+                                (0, 0), win32con.SRCCOPY)
+
+            # Hand the caller its own contiguous BGR copy (format
+            # matches unified_capture.py) rather than the reused,
+            # row-padded DIB pixels
+            return np.ascontiguousarray(self._frame_buffer)
+
         except Exception as e:
             print(f"Capture failed: {e}")
+            # Drop possibly stale GDI state so the next call rebuilds it
+            self._release_gdi()
             return None
+
+    def capture_and_detect(self):
+        """
+        Capture a frame and locate the board grid, with caching.
+
+        Full detection only re-runs when the scene changes: a
+        subsampled per-channel mean of the frame acts as a cheap
+        fingerprint, and while it stays within tolerance of the last
+        frame's the previous detection result is reused.
+
+        Returns:
+            (frame, board_rect) — either may be None on failure
+        """
+        frame = self.capture()
+        if frame is None:
+            return None, None
+
+        # Means over every 16th pixel: ~0.4% of the frame touched
+        fingerprint = frame[::16, ::16].mean(axis=(0, 1))
+        if (self._last_fingerprint is not None
+                and np.abs(fingerprint - self._last_fingerprint).max() < 3.0):
+            return frame, self._last_grid
+
+        self._last_grid = detect_board_grid(frame)
+        self._last_fingerprint = fingerprint
+        return frame, self._last_grid
+
+    def _release_gdi(self) -> None:
+        """Free the cached GDI objects, if any."""
+        # Drop the ndarray view before the DIB memory goes away
+        self._frame_buffer = None
+        if self._hbitmap is not None:
+            try:
+                win32gui.DeleteObject(self._hbitmap)
+            except Exception:
+                pass
+        if self._saveDC is not None:
+            try:
+                self._saveDC.DeleteDC()
+            except Exception:
+                pass
+        if self._mfcDC is not None:
+            try:
+                self._mfcDC.DeleteDC()
+            except Exception:
+                pass
+        if self._hwndDC is not None and self.hwnd:
+            try:
+                win32gui.ReleaseDC(self.hwnd, self._hwndDC)
+            except Exception:
+                pass
+        self._hwndDC = None
+        self._mfcDC = None
+        self._saveDC = None
+        self._hbitmap = None
+        self._dc_key = None
+
+    def close(self) -> None:
+        """Release the cached capture resources."""
+        self._release_gdi()
+
+    def __del__(self):
+        try:
+            self._release_gdi()
+        except Exception:
+            pass
     
-    def capture_region(self, rect: Tuple[int, int, int, int]) -> Optional[np.ndarray]:
+    def capture_region(self, rect: Tuple[int, int, int, int],
+                       frame: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
         """
         Capture a specific region of the window.
-        
+
         Args:
             rect: (x, y, width, height) relative to window
-            
+            frame: Already captured full frame to slice instead of
+                capturing again (callers extracting several regions per
+                tick capture once and pass it to each call)
+
         Returns:
             Screenshot of region as numpy array (RGB)
         """
-        full_capture = self.capture()
+        full_capture = frame if frame is not None else self.capture()
         if full_capture is None:
             return None
-        
+
         x, y, w, h = rect
-        return full_capture[y:y+h, x:x+w]
+        # One explicit SIMD copy here beats the silent copy every
+        # downstream cv2 call makes from a non-contiguous view
+        return np.ascontiguousarray(full_capture[y:y+h, x:x+w])
+
+    def capture_region_into(self, rect: Tuple[int, int, int, int],
+                            out: np.ndarray,
+                            frame: Optional[np.ndarray] = None) -> bool:
+        """
+        Capture a region of the window into a preallocated buffer.
+
+        Callers that poll the same regions every frame keep one buffer
+        per region and reuse it, so the per-frame ndarray churn stays
+        out of steady-state capture loops.
+
+        Args:
+            rect: (x, y, width, height) relative to window
+            out: (height, width, 3) uint8 array the pixels are written to
+            frame: Already captured full frame to slice instead of
+                capturing again
+
+        Returns:
+            True if the region was captured into out
+        """
+        full_capture = frame if frame is not None else self.capture()
+        if full_capture is None:
+            return False
+
+        x, y, w, h = rect
+        try:
+            np.copyto(out, full_capture[y:y+h, x:x+w])
+        except Exception:
+            return False
+        return True
+
+
+class WindowCaptureDXGI(WindowCapture):
+    """
+    Window capture over DXGI Desktop Duplication, with GDI fallback.
+
+    Desktop Duplication hands us each composed frame as a GPU texture
+    copy instead of a synchronous BitBlt, so full-window capture keeps
+    up with the monitor refresh rate. The duplication interface (via
+    dxcam) is created once and reused; capture falls back to the GDI
+    path when dxcam is not installed, the window is not fully on the
+    primary output, or duplication fails.
+    """
+
+    def __init__(self, window_title: str = "五子连珠5.2"):
+        super().__init__(window_title)
+        self._camera = None
+        # Once duplication fails we stay on GDI rather than retrying
+        # (and failing) every frame
+        self._dxgi_failed = not _HAS_DXCAM
+        self._last_dxgi_frame: Optional[np.ndarray] = None
+
+    def capture(self) -> Optional[np.ndarray]:
+        """
+        Capture the current window content via Desktop Duplication.
+
+        Returns:
+            Screenshot as numpy array (BGR format for OpenCV), or None if failed
+        """
+        if self._dxgi_failed:
+            return super().capture()
+
+        if not self.hwnd:
+            if not self.find_window():
+                return None
+
+        try:
+            if self._camera is None:
+                # BGR output matches the GDI path, so callers see the
+                # same frame format from either backend
+                self._camera = dxcam.create(output_color="BGR")
+
+            left, top, right, bottom = win32gui.GetWindowRect(self.hwnd)
+            if (left < 0 or top < 0
+                    or right > self._camera.width
+                    or bottom > self._camera.height):
+                # Duplication only covers the primary output; a window
+                # hanging off it captures through GDI instead
+                return super().capture()
+
+            frame = self._camera.grab(region=(left, top, right, bottom))
+            if frame is None:
+                # No new frame since the last grab (the screen did not
+                # change); the previous frame is still current
+                frame = self._last_dxgi_frame
+                if frame is None:
+                    return super().capture()
+            else:
+                self._last_dxgi_frame = frame
+            return np.ascontiguousarray(frame)
+
+        except Exception as e:
+            print(f"DXGI capture failed, falling back to GDI: {e}")
+            self._release_dxgi()
+            self._dxgi_failed = True
+            return super().capture()
+
+    def _release_dxgi(self) -> None:
+        """Free the cached duplication interface, if any."""
+        self._last_dxgi_frame = None
+        if self._camera is not None:
+            try:
+                self._camera.release()
+            except Exception:
+                pass
+            self._camera = None
+
+    def close(self) -> None:
+        """Release the capture resources of both backends."""
+        self._release_dxgi()
+        super().close()
 
 
 class GameWindowConfig:
@@ -159,8 +469,7 @@ class GameWindowConfig:
             True if loaded successfully
         """
         try:
-            with open(config_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = _json_loads(Path(config_file).read_bytes())
 
             self.board_rect = tuple(data['board_rect'])
             self.high_score_rect = tuple(data.get('high_score_rect', data.get('score_rect')))
@@ -184,16 +493,17 @@ class GameWindowConfig:
             True if saved successfully
         """
         try:
+            # Tuples become lists up front so both JSON backends see
+            # plain containers
             data = {
-                'board_rect': self.board_rect,
-                'high_score_rect': self.high_score_rect,
-                'current_score_rect': self.current_score_rect,
-                'next_balls_rect': self.next_balls_rect,
-                'cell_size': self.cell_size
+                'board_rect': list(self.board_rect) if self.board_rect else None,
+                'high_score_rect': list(self.high_score_rect) if self.high_score_rect else None,
+                'current_score_rect': list(self.current_score_rect) if self.current_score_rect else None,
+                'next_balls_rect': list(self.next_balls_rect) if self.next_balls_rect else None,
+                'cell_size': list(self.cell_size) if self.cell_size else None
             }
 
-            with open(config_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            Path(config_file).write_bytes(_json_dumps(data))
 
             return True
         except Exception as e:
@@ -223,30 +533,70 @@ def detect_board_grid(img: np.ndarray) -> Optional[Tuple[int, int, int, int]]:
     """
     # Convert to grayscale
     gray = cv2.cvtColor(img, cv2.COLOR_RGB2GRAY)
-    
-    # Edge detection
-    edges = cv2.Canny(gray, 50, 150)
-    
-    # Find contours
-    contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-    
-    # Find the largest square-ish contour
-    best_rect = None
-    max_area = 0
-    
-    for contour in contours:
-        # Get bounding rectangle
-        x, y, w, h = cv2.boundingRect(contour)
-        area = w * h
-        
-        # Check if it's roughly square and large enough
-        aspect_ratio = float(w) / h if h > 0 else 0
-        if 0.8 < aspect_ratio < 1.2 and area > 10000:
-            if area > max_area:
-                max_area = area
-                best_rect = (x, y, w, h)
-    
-    return best_rect
+
+    # Board detection tolerates quarter resolution, and threshold +
+    # component stats are linear in pixel count, so work on a pyrDown'd
+    # image and scale the winning rect back up
+    scale = 1
+    while scale < 4 and gray.shape[0] >= 64 and gray.shape[1] >= 64:
+        gray = cv2.pyrDown(gray)
+        scale *= 2
+
+    # Connected components give every candidate's bounding box and
+    # area as arrays in one C pass, so the square-ish/large filter is a
+    # boolean mask instead of a per-contour Python loop
+    _, bw = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+    n, _, stats, _ = cv2.connectedComponentsWithStats(bw)
+    if n <= 1:
+        return None
+
+    # Row 0 is the background component
+    x = stats[1:, cv2.CC_STAT_LEFT]
+    y = stats[1:, cv2.CC_STAT_TOP]
+    w = stats[1:, cv2.CC_STAT_WIDTH]
+    h = stats[1:, cv2.CC_STAT_HEIGHT]
+    area = w * h
+
+    # Keep roughly square, large-enough candidates; take the biggest.
+    # A component spanning the whole frame is the background (e.g. a
+    # uniform image thresholded to a single blob), not the board
+    aspect_ratio = w / np.maximum(h, 1)
+    mask = (aspect_ratio > 0.8) & (aspect_ratio < 1.2) \
+        & (area > 10000 // (scale * scale)) \
+        & ~((w >= gray.shape[1]) & (h >= gray.shape[0]))
+    if not mask.any():
+        return None
+
+    candidates = np.flatnonzero(mask)
+    best = candidates[np.argmax(area[candidates])]
+    return (int(x[best]) * scale, int(y[best]) * scale,
+            int(w[best]) * scale, int(h[best]) * scale)
+
+
+_CELL_BOUNDS_CACHE = {}
+
+
+def _cell_bounds(h: int, w: int, rows: int, cols: int):
+    """
+    Per-cell sampling bounds (center 50%, avoiding borders) for a board
+    image of the given size.
+
+    The geometry is fixed after calibration, so the bounds are computed
+    once per (image size, grid size) and cached as index arrays.
+    """
+    key = (h, w, rows, cols)
+    bounds = _CELL_BOUNDS_CACHE.get(key)
+    if bounds is None:
+        cell_h = h / rows
+        cell_w = w / cols
+        r = np.arange(rows)
+        c = np.arange(cols)
+        y1s = (r * cell_h + cell_h * 0.25).astype(np.intp)
+        y2s = ((r + 1) * cell_h - cell_h * 0.25).astype(np.intp)
+        x1s = (c * cell_w + cell_w * 0.25).astype(np.intp)
+        x2s = ((c + 1) * cell_w - cell_w * 0.25).astype(np.intp)
+        bounds = _CELL_BOUNDS_CACHE[key] = (y1s, y2s, x1s, x2s)
+    return bounds
 
 
 def extract_cell_colors(board_img: np.ndarray, rows: int = 9, cols: int = 9) -> np.ndarray:
@@ -262,24 +612,54 @@ def extract_cell_colors(board_img: np.ndarray, rows: int = 9, cols: int = 9) ->
         Array of shape (rows, cols, 3) with average RGB colors
     """
     h, w = board_img.shape[:2]
-    cell_h = h / rows
-    cell_w = w / cols
-    
-    colors = np.zeros((rows, cols, 3), dtype=np.float32)
-    
-    for row in range(rows):
-        for col in range(cols):
-            # Get cell region (center 50% to avoid borders)
-            y1 = int(row * cell_h + cell_h * 0.25)
-            y2 = int((row + 1) * cell_h - cell_h * 0.25)
-            x1 = int(col * cell_w + cell_w * 0.25)
-            x2 = int((col + 1) * cell_w - cell_w * 0.25)
-            
-            cell_region = board_img[y1:y2, x1:x2]
-            
-            # Calculate average color
-            avg_color = np.mean(cell_region, axis=(0, 1))
-            colors[row, col] = avg_color
-    
-    return colors
+
+    if h >= rows * 4 and w >= cols * 4:
+        # Area-averaging resize is exactly per-cell averaging, done in
+        # one SIMD C call. Shrink to quarter-cells rather than straight
+        # to (rows, cols) so grid lines and ball edges stay out of the
+        # mean: the center 2x2 quarters of each cell are its center 50%
+        quarters = cv2.resize(board_img, (cols * 4, rows * 4),
+                              interpolation=cv2.INTER_AREA)
+        centers = quarters.reshape(rows, 4, cols, 4, 3)[:, 1:3, :, 1:3]
+        return centers.mean(axis=(1, 3), dtype=np.float64).astype(np.float32)
+
+    y1s, y2s, x1s, x2s = _cell_bounds(h, w, rows, cols)
+
+    # Tiny images: summed-area table, each cell mean as four corner
+    # lookups, all rows*cols cells in one vectorized pass
+    integral = np.zeros((h + 1, w + 1, 3), dtype=np.float64)
+    np.cumsum(board_img, axis=0, dtype=np.float64,
+              out=integral[1:, 1:]).cumsum(axis=1, out=integral[1:, 1:])
+
+    sums = (integral[y2s[:, None], x2s[None, :]]
+            - integral[y1s[:, None], x2s[None, :]]
+            - integral[y2s[:, None], x1s[None, :]]
+            + integral[y1s[:, None], x1s[None, :]])
+    counts = (y2s - y1s)[:, None] * (x2s - x1s)[None, :]
+
+    return (sums / np.maximum(counts, 1)[:, :, None]).astype(np.float32)
+
+
+def extract_cell_colors_hsv(board_img: np.ndarray, rows: int = 9,
+                            cols: int = 9) -> np.ndarray:
+    """
+    Extract per-cell average colors and convert them to HSV in one call.
+
+    Hue-based classifiers (see _board_jit.classify_board) want HSV cell
+    means; converting the whole (rows, cols, 3) color grid with a
+    single cvtColor replaces rows*cols per-cell conversions, and the
+    grid is small enough to stay cache-resident throughout.
+
+    Args:
+        board_img: Board image as numpy array (RGB)
+        rows: Number of rows
+        cols: Number of columns
+
+    Returns:
+        Array of shape (rows, cols, 3) with uint8 HSV cell colors
+        (OpenCV convention: H in 0..179)
+    """
+    colors = extract_cell_colors(board_img, rows=rows, cols=cols)
+    rgb = np.clip(colors, 0, 255).astype(np.uint8)
+    return cv2.cvtColor(rgb, cv2.COLOR_RGB2HSV)
 